@@ -8,21 +8,57 @@ Deploys Spring Boot application to Cloud Run using:
 - Policy-based escalation: fast model first, escalate to reasoning on failure
 """
 
-import json
+import asyncio
+import hashlib
 from pathlib import Path
 from typing import Any, Dict
 
-from .base_agent import AgentResult, AgentStatus, BaseAgent, Event, EventType, ModelRole
+import msgspec
+
+from .base_agent import AgentResult, AgentStatus, BackendAnalysis, BaseAgent, Event, EventType, ModelRole
 from .dedalus_tools import (
-    BACKEND_DEPLOYMENT_TOOLS,
+    build_and_push_docker_image,
     build_docker_image,
+    check_docker_buildx,
+    clean_dockerfile_content,
     deploy_to_cloud_run,
+    fingerprint_backend_source,
+    get_image_fingerprint,
     push_docker_image,
     update_cors_origins,
     write_dockerfile,
 )
 
 
+class ToolResult(msgspec.Struct):
+    """Typed view of the JSON returned by the backend deployment tools."""
+    success: bool = False
+    error: str | None = None
+    service_url: str | None = None
+    files_updated: int = 0
+    fingerprint: str | None = None
+    available: bool = False
+
+
+_decode_tool_result = msgspec.json.Decoder(ToolResult).decode
+
+# Static part of the Dockerfile request, sent as the system prompt so the
+# provider can cache it; only the stack details vary per call
+_DOCKERFILE_INSTRUCTIONS = """You are a Docker expert generating Dockerfiles for Spring Boot applications.
+
+Requirements:
+1. Multi-stage build to minimize image size
+2. Use appropriate base images
+3. Optimize layer caching: copy only the build descriptor (pom.xml or build.gradle) and resolve dependencies in their own layer before copying src
+4. Non-root user for security
+5. Health check endpoint
+6. The application MUST listen on the port specified by the PORT environment variable (default 8080). Use -Dserver.port=${PORT:-8080} in the ENTRYPOINT.
+7. If using Spring Boot layered JARs, the correct main class is org.springframework.boot.loader.launch.JarLauncher (NOT ProperLauncherApplication or any other variant).
+8. Prefer using -jar app.jar over layered extraction for simplicity.
+
+Respond with ONLY the raw Dockerfile content, starting with FROM. Do not include any explanations, introductions, summaries, or markdown formatting."""
+
+
 def _escalation_policy(state: Any) -> dict:
     """Dynamic model routing policy: escalate from fast to reasoning model on complex steps.
 
@@ -43,6 +79,9 @@ class BackendDeploymentAgent(BaseAgent):
     for simple deployment operations, with escalation policy.
     """
 
+    DEPENDS_ON = frozenset({EventType.INFRASTRUCTURE_READY, EventType.ANALYSIS_COMPLETE})
+    PUBLISHES = frozenset({EventType.BACKEND_DEPLOYED})
+
     def __init__(self, event_bus, config: Dict[str, Any], dedalus_api_key: str):
         super().__init__(
             name="BackendDeployment",
@@ -56,15 +95,15 @@ class BackendDeploymentAgent(BaseAgent):
         self.logger.info("Starting backend deployment with Dedalus CODE_GENERATION model")
 
         # Get infrastructure information
-        infra_events = self.event_bus.get_history(EventType.INFRASTRUCTURE_READY)
-        if not infra_events:
+        infra_event = self.event_bus.get_last(EventType.INFRASTRUCTURE_READY)
+        if infra_event is None:
             return AgentResult(
                 status=AgentStatus.FAILED,
                 data={},
                 errors=["Infrastructure not provisioned. Run infrastructure agent first."],
             )
 
-        infra_data = infra_events[-1].data
+        infra_data = infra_event.data
         registry_url = infra_data.get("artifact_registry", {}).get("repository_url")
         if not registry_url:
             return AgentResult(
@@ -73,8 +112,11 @@ class BackendDeploymentAgent(BaseAgent):
                 errors=["Artifact Registry repository URL not found"],
             )
 
-        analysis_events = self.event_bus.get_history(EventType.ANALYSIS_COMPLETE)
-        analysis_data = analysis_events[-1].data if analysis_events else {}
+        analysis_event = self.event_bus.get_last(EventType.ANALYSIS_COMPLETE)
+        analysis_data = analysis_event.data if analysis_event else {}
+        backend_analysis = analysis_data.get("backend_analysis")
+        if not isinstance(backend_analysis, BackendAnalysis):
+            backend_analysis = BackendAnalysis.from_dict(analysis_data.get("backend", {}))
 
         warnings: list[str] = []
         errors: list[str] = []
@@ -97,28 +139,47 @@ class BackendDeploymentAgent(BaseAgent):
                     errors=[f"Backend path not found: {backend_path}"],
                 )
 
-            # Step 1: Generate Dockerfile using CODE_GENERATION model
+            # Steps 1 + 2 have no data dependency on each other, so the
+            # Dockerfile LLM round-trip overlaps with the CORS source rewrite.
+            site_name = self.config.get("gcp", {}).get("frontend", {}).get("site_name")
             self.logger.info("Generating Dockerfile with Dedalus CODE_GENERATION model")
-            dockerfile_content = await self._generate_dockerfile(analysis_data)
+            dockerfile_task = asyncio.create_task(self._generate_dockerfile(backend_analysis))
+            cors_task = None
+            if site_name:
+                frontend_url = f"https://{site_name}.web.app"
+                self.logger.info(f"Updating CORS for frontend: {frontend_url}")
+                cors_task = asyncio.create_task(
+                    self._invoke_tool(update_cors_origins, str(backend_path), frontend_url)
+                )
+
+            if cors_task is not None:
+                generated, cors_raw = await asyncio.gather(
+                    dockerfile_task, cors_task, return_exceptions=True,
+                )
+            else:
+                generated, cors_raw = await dockerfile_task, None
+
+            # Step 1: Write the generated Dockerfile (tool call)
+            if isinstance(generated, Exception):
+                raise generated
+            dockerfile_content, dockerfile_cache_file = generated
             write_raw = await self._invoke_tool(write_dockerfile, str(backend_path), dockerfile_content)
-            write_data = json.loads(write_raw)
-            if write_data.get("success"):
+            write_data = _decode_tool_result(write_raw)
+            if write_data.success:
                 deployment_result["dockerfile_created"] = True
             else:
-                errors.append(f"Dockerfile generation failed: {write_data.get('error')}")
+                errors.append(f"Dockerfile generation failed: {write_data.error}")
                 return AgentResult(status=AgentStatus.FAILED, data=deployment_result, errors=errors)
 
-            # Step 2: Update CORS configuration (tool call)
-            site_name = self.config.get("gcp", {}).get("frontend", {}).get("site_name")
-            if site_name:
-                frontend_url = f"https://{site_name}.web.app"
-                self.logger.info(f"Updating CORS for frontend: {frontend_url}")
-                cors_raw = await self._invoke_tool(update_cors_origins, str(backend_path), frontend_url)
-                cors_data = json.loads(cors_raw)
-                if cors_data.get("success"):
-                    self.logger.info(f"CORS updated: {cors_data.get('files_updated', 0)} file(s)")
+            # Step 2: Record the CORS configuration outcome
+            if isinstance(cors_raw, Exception):
+                warnings.append(f"CORS update: {cors_raw}")
+            elif cors_raw is not None:
+                cors_data = _decode_tool_result(cors_raw)
+                if cors_data.success:
+                    self.logger.info(f"CORS updated: {cors_data.files_updated} file(s)")
                 else:
-                    warnings.append(f"CORS update: {cors_data.get('error')}")
+                    warnings.append(f"CORS update: {cors_data.error}")
 
             # Step 3: Build Docker image (tool call)
             gcp_config = self.config.get("gcp", {})
@@ -126,24 +187,61 @@ class BackendDeploymentAgent(BaseAgent):
             service_name = gcp_config.get("backend", {}).get("service_name", "app-backend")
             image_tag = f"{registry_url}/{service_name}:latest"
 
-            self.logger.info(f"Building Docker image: {image_tag}")
-            build_raw = await self._invoke_tool(build_docker_image, str(backend_path), image_tag)
-            build_data = json.loads(build_raw)
-            if build_data.get("success"):
-                deployment_result["image_built"] = True
-            else:
-                errors.append(f"Docker build failed: {build_data.get('error')}")
-                return AgentResult(status=AgentStatus.FAILED, data=deployment_result, errors=errors)
+            # Skip build + push when the registry image was built from identical sources
+            fp_data = _decode_tool_result(await self._invoke_tool(fingerprint_backend_source, str(backend_path)))
+            fingerprint = fp_data.fingerprint or ""
+            if fingerprint:
+                remote_raw = await self._invoke_tool(get_image_fingerprint, image_tag)
+                if _decode_tool_result(remote_raw).fingerprint == fingerprint:
+                    self.logger.info(f"Backend sources unchanged, reusing image: {image_tag}")
+                    deployment_result["image_built"] = True
+                    deployment_result["image_pushed"] = True
+
+            # Prefer a single buildx build --push; fall back to build then push
+            if not deployment_result["image_built"]:
+                buildx_data = _decode_tool_result(await self._invoke_tool(check_docker_buildx))
+                if buildx_data.available:
+                    self.logger.info(f"Building and pushing Docker image: {image_tag}")
+                    bp_raw = await self._invoke_tool(
+                        build_and_push_docker_image, str(backend_path), image_tag, fingerprint,
+                    )
+                    bp_data = _decode_tool_result(bp_raw)
+                    if bp_data.success:
+                        deployment_result["image_built"] = True
+                        deployment_result["image_pushed"] = True
+                    else:
+                        self._discard_cached_dockerfile(dockerfile_cache_file)
+                        errors.append(f"Docker build failed: {bp_data.error}")
+                        return AgentResult(status=AgentStatus.FAILED, data=deployment_result, errors=errors)
+
+            if not deployment_result["image_built"]:
+                self.logger.info(f"Building Docker image: {image_tag}")
+                build_raw = await self._invoke_tool(build_docker_image, str(backend_path), image_tag, fingerprint)
+                build_data = _decode_tool_result(build_raw)
+                if build_data.success:
+                    deployment_result["image_built"] = True
+                else:
+                    self._discard_cached_dockerfile(dockerfile_cache_file)
+                    errors.append(f"Docker build failed: {build_data.error}")
+                    return AgentResult(status=AgentStatus.FAILED, data=deployment_result, errors=errors)
+
+            # Only a Dockerfile that built is worth reusing on the next deploy
+            if dockerfile_cache_file is not None:
+                try:
+                    self._write_private_cache(dockerfile_cache_file, dockerfile_content)
+                except OSError as e:
+                    self.logger.debug(f"Could not cache generated Dockerfile: {e}")
 
             # Step 4: Push image (tool call)
-            self.logger.info("Pushing image to Artifact Registry")
-            push_raw = await self._invoke_tool(push_docker_image, image_tag)
-            push_data = json.loads(push_raw)
-            if push_data.get("success"):
-                deployment_result["image_pushed"] = True
-            else:
-                errors.append(f"Docker push failed: {push_data.get('error')}")
-                return AgentResult(status=AgentStatus.FAILED, data=deployment_result, errors=errors)
+            if not deployment_result["image_pushed"]:
+                self.logger.info("Pushing image to Artifact Registry")
+                push_raw = await self._invoke_tool(push_docker_image, image_tag)
+                push_data = _decode_tool_result(push_raw)
+                if push_data.success:
+                    deployment_result["image_pushed"] = True
+                else:
+                    errors.append(f"Docker push failed: {push_data.error}")
+                    return AgentResult(status=AgentStatus.FAILED, data=deployment_result, errors=errors)
 
             # Step 5: Deploy to Cloud Run (tool call)
             self.logger.info("Deploying to Cloud Run")
@@ -162,12 +260,12 @@ class BackendDeploymentAgent(BaseAgent):
                 env_vars=backend_config.get("env_vars", {}),
                 allow_unauthenticated=backend_config.get("allow_unauthenticated", True),
             )
-            deploy_data = json.loads(deploy_raw)
-            if deploy_data.get("success"):
+            deploy_data = _decode_tool_result(deploy_raw)
+            if deploy_data.success:
                 deployment_result["service_deployed"] = True
-                deployment_result["service_url"] = deploy_data["service_url"]
+                deployment_result["service_url"] = deploy_data.service_url
             else:
-                errors.append(f"Cloud Run deployment failed: {deploy_data.get('error')}")
+                errors.append(f"Cloud Run deployment failed: {deploy_data.error}")
                 return AgentResult(status=AgentStatus.FAILED, data=deployment_result, errors=errors)
 
             # Publish backend deployed event
@@ -195,46 +293,47 @@ class BackendDeploymentAgent(BaseAgent):
                 errors=[str(e)],
             )
 
-    async def _generate_dockerfile(self, analysis_data: Dict[str, Any]) -> str:
+    async def _generate_dockerfile(self, analysis: BackendAnalysis) -> tuple[str, Path | None]:
         """Generate optimized Dockerfile using Dedalus CODE_GENERATION model.
 
-        Uses Claude Opus for code generation with escalation policy:
-        if the model struggles, it escalates to the reasoning model.
+        The response is streamed so its lines show up in the log as they are
+        generated; if the stream fails, a blocking call with the escalation
+        policy (reasoning model when the code model struggles) is made instead.
         Falls back to the bundled template if the LLM response is not valid.
-        """
-        backend_analysis = analysis_data.get("backend", {})
-        build_tool = backend_analysis.get("build_tool", "maven")
-        java_version = backend_analysis.get("java_version", "21")
-        spring_version = backend_analysis.get("spring_boot_version", "3.x")
 
+        Returns (content, cache entry). The entry is None for the template;
+        the caller stores the content there once the image builds and drops
+        the entry if the build fails.
+        """
         prompt = f"""Generate an optimized Dockerfile for a Spring Boot application:
-- Build tool: {build_tool}
-- Java version: {java_version}
-- Spring Boot version: {spring_version}
-
-Requirements:
-1. Multi-stage build to minimize image size
-2. Use appropriate base images
-3. Optimize layer caching
-4. Non-root user for security
-5. Health check endpoint
-6. The application MUST listen on the port specified by the PORT environment variable (default 8080). Use -Dserver.port=${{PORT:-8080}} in the ENTRYPOINT.
-7. If using Spring Boot layered JARs, the correct main class is org.springframework.boot.loader.launch.JarLauncher (NOT ProperLauncherApplication or any other variant).
-8. Prefer using -jar app.jar over layered extraction for simplicity.
-
-Return ONLY valid Dockerfile instructions starting with FROM. Do not include any explanations, summaries, or markdown formatting."""
+- Build tool: {analysis.build_tool}
+- Java version: {analysis.java_version}
+- Spring Boot version: {analysis.spring_boot_version}"""
+
+        # Reuse a previously generated Dockerfile for the same stack (the prompt
+        # embeds build tool, Java and Spring Boot versions)
+        cache_key = hashlib.sha256((_DOCKERFILE_INSTRUCTIONS + prompt).encode()).hexdigest()
+        cache_file = self._dockerfile_cache_path() / cache_key
+        force_regenerate = self.config.get("gcp", {}).get("backend", {}).get("force_regenerate_dockerfile", False)
+        cached = None if force_regenerate else self._read_private_cache(cache_file)
+        if cached is not None:
+            self.logger.info("Using cached Dockerfile for this build stack")
+            return cached, cache_file
 
-        response = await self.run_with_dedalus(
-            prompt=prompt,
-            model=ModelRole.CODE_GENERATION.value,
-            tools=BACKEND_DEPLOYMENT_TOOLS,
-            instructions="You are a Docker expert. Respond with ONLY the raw Dockerfile content. "
-                         "Do not include any explanations, introductions, or summaries before or after.",
-            max_steps=3,
-            policy=_escalation_policy,
-        )
+        try:
+            response = await self._stream_dockerfile(prompt)
+        except Exception as e:
+            # A broken stream cannot be resumed; the blocking call retries transient errors
+            self.logger.warning(f"Streaming Dockerfile generation failed ({e}), retrying without streaming")
+            response = await self.run_with_dedalus(
+                prompt=prompt,
+                model=ModelRole.CODE_GENERATION.value,
+                instructions=_DOCKERFILE_INSTRUCTIONS,
+                max_steps=3,
+                policy=_escalation_policy,
+            )
 
-        content = response.strip()
+        content = clean_dockerfile_content(response)
 
         # Validate that the response contains at least a FROM instruction
         if not any(line.strip().startswith("FROM") for line in content.split("\n")):
@@ -242,9 +341,43 @@ Return ONLY valid Dockerfile instructions starting with FROM. Do not include any
                 "LLM response did not contain valid Dockerfile instructions, "
                 "falling back to bundled template"
             )
-            content = self._load_dockerfile_template(java_version, build_tool)
+            return self._load_dockerfile_template(analysis.java_version, analysis.build_tool), None
 
-        return content
+        return content, cache_file
+
+    def _discard_cached_dockerfile(self, cache_file: Path | None) -> None:
+        """Drop a cached Dockerfile whose image failed to build, so the next deploy regenerates it."""
+        if cache_file is None:
+            return
+        try:
+            cache_file.unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.debug(f"Could not drop cached Dockerfile: {e}")
+
+    async def _stream_dockerfile(self, prompt: str) -> str:
+        """Stream the generated Dockerfile, logging each line as soon as it is complete.
+
+        The log is what the CLI and web UI show, so users watch the Dockerfile
+        being written instead of waiting on the whole completion.
+        """
+        parts: list[str] = []
+        pending = ""
+        async for delta in self.stream_with_dedalus(
+            prompt=prompt,
+            model=ModelRole.CODE_GENERATION.value,
+            instructions=_DOCKERFILE_INSTRUCTIONS,
+        ):
+            parts.append(delta)
+            *lines, pending = (pending + delta).split("\n")
+            for line in lines:
+                self.logger.info(f"Dockerfile | {line}")
+        if pending:
+            self.logger.info(f"Dockerfile | {pending}")
+        return "".join(parts)
+
+    def _dockerfile_cache_path(self) -> Path:
+        """Directory holding LLM-generated Dockerfiles keyed by prompt hash."""
+        return self._private_cache_dir("dockerfiles")
 
     def _load_dockerfile_template(self, java_version: str, build_tool: str) -> str:
         """Load the bundled Dockerfile template as a fallback."""
@@ -6,16 +6,36 @@ with multi-model handoffs and tool calling.
 """
 
 import asyncio
+import hashlib
+import json
 import logging
+import os
+import random
+import re
+import time
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from functools import lru_cache, singledispatch
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, List, Optional, Tuple
 from uuid import uuid4
 
-from dedalus_labs import AsyncDedalus
+from dedalus_labs import (
+    APIConnectionError,
+    AsyncDedalus,
+    InternalServerError,
+    RateLimitError,
+)
 from dedalus_labs.lib.runner import DedalusRunner
+from dedalus_labs.types.chat import ChatCompletion
+
+try:
+    from dedalus_labs.lib.runner.core import _RunResult as RunResult
+except ImportError:  # Private in the SDK; fall back to attribute lookup
+    RunResult = None
 
 
 # ---------------------------------------------------------------------------
@@ -71,6 +91,24 @@ class Event:
     event_id: str = field(default_factory=lambda: str(uuid4()))
 
 
+@dataclass(slots=True, frozen=True)
+class BackendAnalysis:
+    """Typed view of the backend build facts shared between agents."""
+    build_tool: str = "maven"
+    java_version: str = "21"
+    spring_boot_version: str = "3.x"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BackendAnalysis":
+        """Build from the analyzer's raw backend dict, keeping defaults for gaps."""
+        defaults = cls()
+        return cls(
+            build_tool=data.get("build_tool") or defaults.build_tool,
+            java_version=str(data.get("java_version") or defaults.java_version),
+            spring_boot_version=str(data.get("spring_boot_version") or defaults.spring_boot_version),
+        )
+
+
 @dataclass
 class AgentResult:
     """Result of agent execution."""
@@ -90,42 +128,270 @@ class EventBus:
     Event bus for agent communication.
 
     Implements pub-sub pattern for decoupled agent communication.
+    publish() records the event and queues it for a background dispatcher,
+    so publishers never wait on subscriber handlers; publish_sync() keeps
+    the inline, ordered delivery for callers that need it.
     """
 
+    # Events buffered for the dispatcher before publish() applies backpressure
+    QUEUE_SIZE = 1024
+    # Retained history overall and per event type; older events are dropped
+    HISTORY_SIZE = 10000
+    TYPE_HISTORY_SIZE = 2000
+
     def __init__(self):
-        self._subscribers: Dict[EventType, List[Callable]] = {}
-        self._event_history: List[Event] = []
+        # event type -> [(is_coroutine_function, callback)], classified once at subscribe()
+        self._subscribers: Dict[EventType, List[Tuple[bool, Callable]]] = {}
+        self._event_history: deque = deque(maxlen=self.HISTORY_SIZE)
+        self._by_type: Dict[EventType, deque] = defaultdict(
+            lambda: deque(maxlen=self.TYPE_HISTORY_SIZE)
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def subscribe(self, event_type: EventType, callback: Callable[[Event], None]) -> None:
         """Subscribe to an event type."""
         if event_type not in self._subscribers:
             self._subscribers[event_type] = []
-        self._subscribers[event_type].append(callback)
+        self._subscribers[event_type].append(
+            (asyncio.iscoroutinefunction(callback), callback)
+        )
         self.logger.debug(f"Subscribed to {event_type.value}")
 
-    async def publish(self, event: Event) -> None:
-        """Publish an event to all subscribers."""
+    def _record(self, event: Event) -> None:
+        """Append an event to the overall and per-type history buffers."""
         self._event_history.append(event)
+        self._by_type[event.event_type].append(event)
         self.logger.info(
             f"Event published: {event.event_type.value} from {event.source_agent}"
         )
 
-        if event.event_type in self._subscribers:
-            for callback in self._subscribers[event.event_type]:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(event)
-                    else:
-                        callback(event)
-                except Exception as e:
-                    self.logger.error(f"Error in event callback: {str(e)}")
+    async def publish(self, event: Event) -> None:
+        """Publish an event; subscribers are notified asynchronously."""
+        self._record(event)
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+        # A subscriber publishing from the dispatcher must not wait on its own full queue
+        if asyncio.current_task() is self._dispatcher and self._queue.full():
+            await self._notify(event)
+            return
+        await self._queue.put(event)
+
+    async def publish_sync(self, event: Event) -> None:
+        """Publish an event and wait until every subscriber has handled it."""
+        self._record(event)
+        await self._notify(event)
+
+    async def drain(self) -> None:
+        """Wait until all queued events have been delivered to subscribers."""
+        if self._queue is not None and self._dispatcher is not None and not self._dispatcher.done():
+            await self._queue.join()
+
+    async def _dispatch_loop(self) -> None:
+        """Deliver queued events to subscribers in publish order."""
+        while True:
+            event = await self._queue.get()
+            try:
+                await self._notify(event)
+            finally:
+                self._queue.task_done()
+
+    async def _notify(self, event: Event) -> None:
+        """Run all subscriber callbacks for an event.
+
+        Sync callbacks run inline; async callbacks are awaited concurrently so
+        one slow handler does not delay the others.
+        """
+        callbacks = self._subscribers.get(event.event_type)
+        if not callbacks:
+            return
+        coros = []
+        for is_coro, callback in callbacks:
+            if is_coro:
+                coros.append(callback(event))
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error(f"Error in event callback: {str(e)}")
+        if not coros:
+            return
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Error in event callback: {str(result)}")
 
     def get_history(self, event_type: Optional[EventType] = None) -> List[Event]:
         """Get event history, optionally filtered by type."""
         if event_type:
-            return [e for e in self._event_history if e.event_type == event_type]
-        return self._event_history
+            return list(self._by_type.get(event_type, ()))
+        return list(self._event_history)
+
+    def get_last(self, event_type: EventType) -> Optional[Event]:
+        """Get the most recent event of a type, or None if none was published."""
+        history = self._by_type.get(event_type)
+        return history[-1] if history else None
+
+
+class ResponseCache:
+    """In-process LLM response cache with TTL expiry and LFU eviction.
+
+    Keys are SHA-256 digests of everything that shapes a response (model,
+    prompt, instructions, tools, MCP servers), so identical requests issued
+    on retries or by several agents skip the provider round-trip.
+    """
+
+    MAX_ENTRIES = 1000
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        # key -> [value, expires_at, hits]
+        self._entries: Dict[str, list] = {}
+        # scope -> [(unit embedding, key)]; scope pins model/instructions/tools
+        self._embeddings: Dict[str, List[tuple]] = {}
+
+    @staticmethod
+    def make_key(
+        model: Any,
+        prompt: str,
+        instructions: Optional[str] = None,
+        tools: Optional[list] = None,
+        mcp_servers: Optional[list] = None,
+    ) -> str:
+        """Build the cache key for one runner invocation."""
+        tools_fingerprint = ",".join(
+            sorted(f"{t.__module__}.{t.__qualname__}" for t in (tools or []))
+        )
+        raw = "|".join([
+            repr(model),
+            prompt,
+            tools_fingerprint,
+            instructions or "",
+            ",".join(mcp_servers or []),
+        ])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del self._entries[key]
+            return None
+        entry[2] += 1
+        return entry[0]
+
+    def update(self, key: str, value: str, ttl: float) -> None:
+        """Store a response, evicting the least frequently used entry when full."""
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            now = time.monotonic()
+            expired = [k for k, e in self._entries.items() if e[1] < now]
+            for k in expired:
+                del self._entries[k]
+            if len(self._entries) >= self.max_entries:
+                victim = min(self._entries, key=lambda k: self._entries[k][2])
+                del self._entries[victim]
+        self._entries[key] = [value, time.monotonic() + ttl, 0]
+
+    def lookup_similar(self, scope: str, embedding: List[float], threshold: float) -> Optional[str]:
+        """Return the response whose prompt embedding is closest to embedding.
+
+        Only prompts cached under the same scope are considered, and the best
+        cosine similarity must reach threshold.
+        """
+        query = _unit_vector(embedding)
+        best_key, best_score = None, threshold
+        for vector, key in self._embeddings.get(scope, []):
+            score = sum(a * b for a, b in zip(vector, query))
+            if score >= best_score:
+                best_key, best_score = key, score
+        return self.lookup(best_key) if best_key is not None else None
+
+    def add_embedding(self, scope: str, embedding: List[float], key: str) -> None:
+        """Index a cached response's prompt embedding for similarity lookups."""
+        live = [item for item in self._embeddings.get(scope, []) if item[1] in self._entries]
+        live.append((_unit_vector(embedding), key))
+        self._embeddings[scope] = live
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+        self._embeddings.clear()
+
+
+def _unit_vector(vector: List[float]) -> List[float]:
+    """Scale vector to unit length so dot products are cosine similarities."""
+    norm = sum(v * v for v in vector) ** 0.5
+    return [v / norm for v in vector] if norm else list(vector)
+
+
+# Shared by all agents so identical prompts across agents hit the same entry
+_response_cache = ResponseCache()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+@lru_cache(maxsize=4)
+def _get_dedalus_client(api_key: str) -> AsyncDedalus:
+    """Return the process-wide Dedalus client for an API key.
+
+    Agents share one client so its HTTP connection pool (and TLS sessions)
+    is reused instead of every agent opening its own.
+    """
+    return AsyncDedalus(api_key=api_key)
+
+
+@singledispatch
+def _extract_text(result: Any) -> str:
+    """Extract the text output from a runner result, dispatched by type."""
+    output = getattr(result, "final_output", None)
+    return output if output is not None else str(result)
+
+
+@_extract_text.register
+def _(result: str) -> str:
+    return result
+
+
+@_extract_text.register
+def _(result: ChatCompletion) -> str:
+    return result.choices[0].message.content or ""
+
+
+if RunResult is not None:
+    @_extract_text.register(RunResult)
+    def _(result: Any) -> str:
+        return result.final_output
+
+
+# Model routing heuristics for run_with_dedalus calls without an explicit model
+_FAST_PROMPT_MAX_CHARS = 2000
+_CODE_GEN_RE = re.compile(r"\b(?:write|implement|refactor|generate)\b", re.IGNORECASE)
+
+# cache key -> future of the provider call currently serving that request
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _user_cache_dir() -> Path:
+    """Per-user cache root: $XDG_CACHE_HOME/cloudify, defaulting to ~/.cache/cloudify."""
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "cloudify"
+
+
+def _is_private(st: os.stat_result) -> bool:
+    """True if st belongs to the current user and is not group/world writable."""
+    owned = not hasattr(os, "getuid") or st.st_uid == os.getuid()
+    return owned and not st.st_mode & 0o022
+
+
+# Provider errors worth retrying; auth/validation errors fail fast.
+# APIConnectionError also covers APITimeoutError.
+_RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError, asyncio.TimeoutError)
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 30.0
 
 
 class BaseAgent(ABC):
@@ -139,8 +405,17 @@ class BaseAgent(ABC):
     - MCP server connectivity
     - Logging and error handling
     - State management
+
+    Subclasses declare the events they consume (DEPENDS_ON) and emit
+    (PUBLISHES); the orchestrator derives the execution DAG from these.
     """
 
+    DEPENDS_ON: FrozenSet[EventType] = frozenset()
+    PUBLISHES: FrozenSet[EventType] = frozenset()
+
+    # Caps in-flight LLM calls across all agents (created on first use)
+    _llm_semaphore: Optional[asyncio.Semaphore] = None
+
     def __init__(
         self,
         name: str,
@@ -155,7 +430,7 @@ class BaseAgent(ABC):
         self.logger = logging.getLogger(f"Agent.{name}")
 
         # Initialize Dedalus client & runner (replaces raw Anthropic client)
-        self.dedalus_client = AsyncDedalus(api_key=dedalus_api_key)
+        self.dedalus_client = _get_dedalus_client(dedalus_api_key)
         self.runner = DedalusRunner(self.dedalus_client)
 
         # Agent state
@@ -189,10 +464,11 @@ class BaseAgent(ABC):
 
         return await tool_fn(*args, **kwargs)
 
-    def _on_tool_event(self, event: Any) -> None:
+    def _on_tool_event(self, event: Any) -> str:
         """Callback fired when the DedalusRunner invokes a tool.
 
-        Publishes a TOOL_INVOKED event for real-time dashboard tracking.
+        Publishes a TOOL_INVOKED event for real-time dashboard tracking and
+        returns the tool name.
         """
         tool_name = getattr(event, "tool_name", str(event))
         self._tools_called.append(tool_name)
@@ -207,10 +483,11 @@ class BaseAgent(ABC):
             )))
         except RuntimeError:
             pass  # No running loop – skip event
+        return tool_name
 
     async def execute(self) -> AgentResult:
         """Execute the agent."""
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.monotonic()
         self.status = AgentStatus.RUNNING
 
         await self.event_bus.publish(Event(
@@ -223,7 +500,7 @@ class BaseAgent(ABC):
             self.logger.info(f"Starting {self.name}")
             result = await self._execute_impl()
 
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = time.monotonic() - start_time
             result.execution_time = execution_time
             result.models_used = self._models_used
             result.tools_called = self._tools_called
@@ -262,7 +539,7 @@ class BaseAgent(ABC):
             return result
 
         except Exception as e:
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = time.monotonic() - start_time
             self.logger.error(f"Error in {self.name}: {str(e)}", exc_info=True)
 
             result = AgentResult(
@@ -301,6 +578,7 @@ class BaseAgent(ABC):
         instructions: str | None = None,
         max_steps: int = 10,
         policy: Any | None = None,
+        use_cache: bool = True,
     ) -> str:
         """
         Run a task using the DedalusRunner with model handoffs and tool calling.
@@ -314,20 +592,107 @@ class BaseAgent(ABC):
 
         Args:
             prompt: The user prompt / task description.
-            model: Model ID or list of models for handoff routing.
+            model: Model ID or list of models for handoff routing; chosen by
+                _pick_model when omitted.
             tools: List of callable tool functions.
             mcp_servers: List of MCP server slugs/URLs.
             instructions: System instructions for the agent.
             max_steps: Max agentic loop iterations.
             policy: Optional policy function for dynamic routing.
+            use_cache: Serve identical requests from the shared response cache.
 
         Returns:
             The final text output from the runner.
         """
-        # Default model from config
+        ai_config = self.config.get("ai", {})
+
         if model is None:
-            model = self.config.get("ai", {}).get("model", "anthropic/claude-opus-4-6")
+            model = self._pick_model(prompt, tools, max_steps)
+
+        temperature = ai_config.get("temperature", 0.3)
+        cache_config = ai_config.get("response_cache", {})
+        cache_key = None
+        prompt_embedding = None
+        if use_cache and cache_config.get("enabled", True):
+            # Whitespace-only prompt differences are irrelevant when sampling
+            # is deterministic; keep prompts verbatim otherwise
+            key_prompt = _WHITESPACE_RE.sub(" ", prompt).strip() if temperature == 0 else prompt
+            cache_key = ResponseCache.make_key(model, key_prompt, instructions, tools, mcp_servers)
+            cached = _response_cache.lookup(cache_key)
+            if cached is None and cache_config.get("semantic", False) and temperature < 0.2:
+                # Near-duplicate prompts only share answers when sampling is
+                # close to deterministic
+                semantic_scope = ResponseCache.make_key(model, "", instructions, tools, mcp_servers)
+                prompt_embedding = await self._embed_prompt(prompt, cache_config)
+                if prompt_embedding is not None:
+                    cached = _response_cache.lookup_similar(
+                        semantic_scope, prompt_embedding, cache_config.get("similarity_threshold", 0.92),
+                    )
+            if cached is not None:
+                self.logger.debug(f"Response cache hit for model={model}")
+                return cached
+
+        if cache_key is None:
+            return await self._call_runner(prompt, model, tools, mcp_servers, instructions, max_steps, policy, temperature)
+
+        # Singleflight: concurrent identical requests share one provider call
+        while cache_key in _inflight:
+            leader = _inflight[cache_key]
+            self.logger.debug(f"Joining in-flight request for model={model}")
+            try:
+                return await asyncio.shield(leader)
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise  # This caller was cancelled, not the shared call
+                # The leading caller was cancelled; issue (or join) a fresh call
+
+        future = asyncio.get_running_loop().create_future()
+        _inflight[cache_key] = future
+        try:
+            output = await self._call_runner(prompt, model, tools, mcp_servers, instructions, max_steps, policy, temperature)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; followers re-raise it themselves
+            raise
+        finally:
+            del _inflight[cache_key]
+        future.set_result(output)
+
+        if isinstance(output, str):
+            _response_cache.update(cache_key, output, cache_config.get("ttl_seconds", 3600))
+            if prompt_embedding is not None:
+                _response_cache.add_embedding(semantic_scope, prompt_embedding, cache_key)
+
+        return output
+
+    def _pick_model(self, prompt: str, tools: list | None, max_steps: int) -> str:
+        """Choose the cheapest model role suited to a request with no explicit model.
+
+        Single-step, tool-free short prompts go to the FAST model, code
+        writing goes to CODE_GENERATION, and everything else uses the
+        configured default model.
+        """
+        if not tools and max_steps <= 1 and len(prompt) < _FAST_PROMPT_MAX_CHARS:
+            return ModelRole.FAST.value
+        if _CODE_GEN_RE.search(prompt):
+            return ModelRole.CODE_GENERATION.value
+        return self.config.get("ai", {}).get("model", ModelRole.REASONING.value)
 
+    async def _call_runner(
+        self,
+        prompt: str,
+        model: str | list[str],
+        tools: list | None,
+        mcp_servers: list[str] | None,
+        instructions: str | None,
+        max_steps: int,
+        policy: Any | None,
+        temperature: float,
+    ) -> Any:
+        """Issue one DedalusRunner call, tracking models and tools used."""
         # Track which model(s) we're using
         if isinstance(model, list):
             self._models_used.extend(model)
@@ -341,14 +706,19 @@ class BaseAgent(ABC):
             data={"model": model, "prompt_preview": prompt[:100]},
         ))
 
+        # Tools already recorded through on_tool_event during this run
+        reported: List[str] = []
         kwargs: Dict[str, Any] = {
             "input": prompt,
             "model": model,
             "max_steps": max_steps,
-            "on_tool_event": self._on_tool_event,
+            "on_tool_event": lambda event: reported.append(self._on_tool_event(event)),
         }
 
         if tools:
+            # Stable ordering keeps the serialized tool schemas byte-identical
+            # between calls so providers can reuse the cached prompt prefix
+            tools = sorted(tools, key=lambda t: t.__name__)
             kwargs["tools"] = tools
         if mcp_servers:
             kwargs["mcp_servers"] = mcp_servers
@@ -357,18 +727,193 @@ class BaseAgent(ABC):
         if policy:
             kwargs["policy"] = policy
 
-        temperature = self.config.get("ai", {}).get("temperature", 0.3)
         kwargs["temperature"] = temperature
+        # Route calls sharing the static prefix (model, instructions, tool set)
+        # to the same provider-side prompt cache
+        kwargs["prompt_cache_key"] = ResponseCache.make_key(model, "", instructions, tools)[:32]
 
         self.logger.debug(f"DedalusRunner.run() with model={model}, tools={[t.__name__ for t in (tools or [])]}")
 
-        result = await self.runner.run(**kwargs)
+        result = await self._run_with_retries(kwargs)
 
-        # Track tools called from the RunResult
-        if hasattr(result, "tools_called") and result.tools_called:
-            self._tools_called.extend(result.tools_called)
+        # RunResult.tools_called repeats what on_tool_event reported; only
+        # record the calls the callback did not see (some SDK versions
+        # never fire it)
+        tools_called = getattr(result, "tools_called", None)
+        if tools_called and len(tools_called) > len(reported):
+            self._tools_called.extend(tools_called[len(reported):])
 
-        return result.final_output
+        return _extract_text(result)
+
+    async def stream_with_dedalus(
+        self,
+        prompt: str,
+        model: str | list[str] | None = None,
+        mcp_servers: list[str] | None = None,
+        instructions: str | None = None,
+        max_steps: int = 1,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a runner response as text deltas as the model produces them.
+
+        Use this when output can be consumed incrementally (progress display,
+        early parsing). Streaming bypasses the response cache and is not
+        retried, since a partially consumed stream cannot be replayed.
+
+        Args:
+            prompt: The user prompt / task description.
+            model: Model ID or list of models; chosen by _pick_model when omitted.
+            mcp_servers: List of MCP server slugs/URLs.
+            instructions: System instructions for the agent.
+            max_steps: Max agentic loop iterations.
+
+        Yields:
+            Text fragments of the response, in order.
+        """
+        if model is None:
+            model = self._pick_model(prompt, None, max_steps)
+        if isinstance(model, list):
+            self._models_used.extend(model)
+        else:
+            self._models_used.append(model)
+
+        await self.event_bus.publish(Event(
+            event_type=EventType.MODEL_HANDOFF,
+            source_agent=self.name,
+            data={"model": model, "prompt_preview": prompt[:100]},
+        ))
+
+        kwargs: Dict[str, Any] = {
+            "input": prompt,
+            "model": model,
+            "max_steps": max_steps,
+            "stream": True,
+            "temperature": self.config.get("ai", {}).get("temperature", 0.3),
+            "prompt_cache_key": ResponseCache.make_key(model, "", instructions)[:32],
+        }
+        if mcp_servers:
+            kwargs["mcp_servers"] = mcp_servers
+        if instructions:
+            kwargs["instructions"] = instructions
+
+        async with self._llm_slot():
+            async for chunk in self.runner.run(**kwargs):
+                choices = getattr(chunk, "choices", None)
+                if choices and choices[0].delta.content:
+                    yield choices[0].delta.content
+
+    async def _embed_prompt(self, prompt: str, cache_config: Dict[str, Any]) -> Optional[List[float]]:
+        """Embed a prompt for semantic cache lookups; None if the call fails."""
+        try:
+            response = await self.dedalus_client.embeddings.create(
+                input=prompt,
+                model=cache_config.get("embedding_model", "openai/text-embedding-3-small"),
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            self.logger.debug(f"Prompt embedding failed, skipping semantic cache: {e}")
+            return None
+
+    def _llm_slot(self) -> asyncio.Semaphore:
+        """Return the semaphore capping in-flight LLM calls across all agents."""
+        if BaseAgent._llm_semaphore is None:
+            BaseAgent._llm_semaphore = asyncio.Semaphore(
+                self.config.get("migration", {}).get("agents", {}).get("max_concurrent_llm_calls", 8)
+            )
+        return BaseAgent._llm_semaphore
+
+    async def _run_with_retries(self, kwargs: Dict[str, Any]) -> Any:
+        """Call the runner under the shared LLM semaphore, retrying transient errors.
+
+        Backoff uses decorrelated jitter so agents failing together do not
+        retry in lockstep.
+        """
+        max_retries = self.config.get("migration", {}).get("agents", {}).get("max_retries", 3)
+
+        delay = _RETRY_BASE_DELAY
+        for attempt in range(max_retries + 1):
+            try:
+                async with self._llm_slot():
+                    return await self.runner.run(**kwargs)
+            except _RETRYABLE_ERRORS as e:
+                if attempt == max_retries:
+                    raise
+                delay = min(_RETRY_MAX_DELAY, random.uniform(_RETRY_BASE_DELAY, delay * 3))
+                # Lazy %-formatting: nothing is rendered unless the record is
+                # emitted; the traceback is logged once, by whoever handles
+                # the final failure
+                self.logger.warning(
+                    "LLM call failed (%s: %s), retry %d/%d in %.1fs",
+                    type(e).__name__, e, attempt + 1, max_retries, delay,
+                )
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _private_cache_dir(name: str) -> Path:
+        """Per-user directory for cache entries of one kind (created on first write)."""
+        return _user_cache_dir() / name
+
+    @staticmethod
+    def _read_private_cache(cache_file: Path) -> Optional[str]:
+        """Return a cache entry's text, or None if missing or not private to this user.
+
+        Entries that another user could have written (foreign owner, or a
+        group/world-writable file or directory) are never trusted.
+        """
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                if not (_is_private(os.fstat(f.fileno())) and _is_private(os.stat(cache_file.parent))):
+                    return None
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write_private_cache(cache_file: Path, content: str) -> None:
+        """Atomically write a cache entry readable only by this user (raises OSError)."""
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_file, cache_file)
+
+    @staticmethod
+    def _recommendations_cache_path() -> Path:
+        """Directory holding LLM recommendations cached across runs."""
+        return BaseAgent._private_cache_dir("recommendations")
+
+    def _recommendations_cache_file(self, key_data: Any) -> Path:
+        """Cache file for recommendations derived from key_data (any JSON-serializable value)."""
+        snapshot = json.dumps(key_data, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.blake2b(snapshot.encode(), digest_size=16).hexdigest()
+        return self._recommendations_cache_path() / f"{self.name}-{digest}.json"
+
+    def _load_cached_recommendations(self, cache_file: Path) -> Optional[List[str]]:
+        """Return recommendations stored by a previous run, or None.
+
+        Always None when ai.force_regenerate_recommendations is set.
+        """
+        if self.config.get("ai", {}).get("force_regenerate_recommendations", False):
+            return None
+        raw = self._read_private_cache(cache_file)
+        if raw is None:
+            return None
+        try:
+            cached = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(cached, list):
+            return None
+        self.logger.info("Using cached recommendations from a previous run")
+        return cached
+
+    def _store_cached_recommendations(self, cache_file: Path, recommendations: List[str]) -> None:
+        """Persist recommendations atomically; failures only cost the next run a model call."""
+        try:
+            self._write_private_cache(cache_file, json.dumps(recommendations))
+        except OSError as e:
+            self.logger.debug(f"Could not cache recommendations: {e}")
 
     def update_state(self, key: str, value: Any) -> None:
         """Update agent state."""
@@ -7,22 +7,43 @@ Analyzes the source application using:
 - MCP server (Brave Search) for researching migration best practices
 """
 
+import asyncio
 import json
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict
 
-from .base_agent import AgentResult, AgentStatus, BaseAgent, Event, EventType, ModelRole
+import msgspec
+
+from .base_agent import AgentResult, AgentStatus, BackendAnalysis, BaseAgent, Event, EventType, ModelRole
 from .dedalus_tools import (
-    ANALYSIS_TOOLS,
     analyze_react_app,
     analyze_spring_properties,
     detect_database_type,
     extract_api_endpoints,
+    get_tools,
     scan_gradle_build,
     scan_maven_pom,
 )
 
 
+# Collections embedded in the recommendations prompt are cut to this many
+# entries; large repos otherwise inflate the prompt with every endpoint/property
+_PROMPT_PREVIEW_ITEMS = 20
+
+
+def _prompt_preview(section: Dict[str, Any]) -> Dict[str, Any]:
+    """Return section with every dict/list value truncated to _PROMPT_PREVIEW_ITEMS entries."""
+    preview: Dict[str, Any] = {}
+    for key, value in section.items():
+        if isinstance(value, dict):
+            value = dict(islice(value.items(), _PROMPT_PREVIEW_ITEMS))
+        elif isinstance(value, list):
+            value = value[:_PROMPT_PREVIEW_ITEMS]
+        preview[key] = value
+    return preview
+
+
 class CodeAnalyzerAgent(BaseAgent):
     """
     Code Analyzer agent powered by Dedalus SDK.
@@ -31,6 +52,9 @@ class CodeAnalyzerAgent(BaseAgent):
     scanning source code artifacts.
     """
 
+    DEPENDS_ON = frozenset()
+    PUBLISHES = frozenset({EventType.ANALYSIS_COMPLETE})
+
     def __init__(self, event_bus, config: Dict[str, Any], dedalus_api_key: str):
         super().__init__(
             name="CodeAnalyzer",
@@ -65,28 +89,24 @@ class CodeAnalyzerAgent(BaseAgent):
             backend_path = source_path / self.config["source"]["backend"]["path"]
             frontend_path = source_path / self.config["source"]["frontend"]["path"]
 
-            # Phase 1: Use tools directly to gather raw data
+            # Phase 1: Use tools directly to gather raw data; the backend and
+            # frontend scans are independent, so they run concurrently
+            scans: Dict[str, Any] = {}
             if backend_path.exists():
                 self.logger.info("Scanning backend with Dedalus tools")
-                backend_analysis = await self._analyze_backend(str(backend_path))
-                analysis_result["backend"] = backend_analysis
+                scans["backend"] = self._analyze_backend_and_database(str(backend_path), analysis_result)
             else:
                 errors.append(f"Backend path not found: {backend_path}")
 
             if frontend_path.exists():
                 self.logger.info("Scanning frontend with Dedalus tools")
-                frontend_raw = await self._invoke_tool(analyze_react_app, str(frontend_path))
-                analysis_result["frontend"] = json.loads(frontend_raw)
+                scans["frontend"] = self._analyze_frontend(str(frontend_path))
             else:
                 errors.append(f"Frontend path not found: {frontend_path}")
 
-            # Phase 2: Analyze database config
-            db_url = analysis_result["backend"].get("database_config", {}).get(
-                "spring.datasource.url", ""
-            )
-            if db_url:
-                db_raw = await self._invoke_tool(detect_database_type, db_url)
-                analysis_result["database"] = json.loads(db_raw)
+            # Phase 2 (database config) is chained onto the backend scan, so it
+            # overlaps the frontend scan instead of waiting for it
+            analysis_result.update(zip(scans, await asyncio.gather(*scans.values())))
 
             # Phase 3: Use Dedalus REASONING model + tools + MCP for recommendations
             if not errors:
@@ -95,11 +115,15 @@ class CodeAnalyzerAgent(BaseAgent):
             else:
                 warnings.append("Skipping AI recommendations due to analysis errors")
 
-            # Publish analysis complete event
+            # Publish analysis complete event; downstream agents read the
+            # typed backend view instead of re-walking the nested dict
             await self.event_bus.publish(Event(
                 event_type=EventType.ANALYSIS_COMPLETE,
                 source_agent=self.name,
-                data=analysis_result,
+                data={
+                    **analysis_result,
+                    "backend_analysis": BackendAnalysis.from_dict(analysis_result["backend"]),
+                },
             ))
 
             status = AgentStatus.SUCCESS if not errors else AgentStatus.FAILED
@@ -137,50 +161,75 @@ class CodeAnalyzerAgent(BaseAgent):
 
         bp = Path(backend_path)
 
-        # Detect build tool and parse
+        # Properties, endpoints and the build file are independent scans
+        scans = [
+            self._invoke_tool(analyze_spring_properties, backend_path),
+            self._invoke_tool(extract_api_endpoints, backend_path),
+        ]
         if (bp / "pom.xml").exists():
             analysis["build_tool"] = "maven"
-            maven_raw = await self._invoke_tool(scan_maven_pom, backend_path)
-            maven_data = json.loads(maven_raw)
-            analysis["java_version"] = maven_data.get("java_version")
-            analysis["spring_boot_version"] = maven_data.get("spring_boot_version")
-            analysis["dependencies"] = maven_data.get("dependencies", [])
+            scans.append(self._invoke_tool(scan_maven_pom, backend_path))
         elif (bp / "build.gradle").exists():
             analysis["build_tool"] = "gradle"
-            gradle_raw = await self._invoke_tool(scan_gradle_build, backend_path)
-            gradle_data = json.loads(gradle_raw)
-            analysis["java_version"] = gradle_data.get("java_version")
-            analysis["dependencies"] = gradle_data.get("dependencies", [])
-
-        # Analyze properties
-        props_raw = await self._invoke_tool(analyze_spring_properties, backend_path)
-        props_data = json.loads(props_raw)
+            scans.append(self._invoke_tool(scan_gradle_build, backend_path))
+
+        props_raw, endpoints_raw, *build_raw = await asyncio.gather(*scans)
+
+        if build_raw:
+            build_data = msgspec.json.decode(build_raw[0])
+            analysis["java_version"] = build_data.get("java_version")
+            analysis["dependencies"] = build_data.get("dependencies", [])
+            if analysis["build_tool"] == "maven":
+                analysis["spring_boot_version"] = build_data.get("spring_boot_version")
+
+        props_data = msgspec.json.decode(props_raw)
         analysis["database_config"] = props_data.get("database_config", {})
         analysis["server_config"] = props_data.get("server_config", {})
 
-        # Extract API endpoints
-        endpoints_raw = await self._invoke_tool(extract_api_endpoints, backend_path)
-        analysis["controllers"] = json.loads(endpoints_raw)
+        analysis["controllers"] = msgspec.json.decode(endpoints_raw)
 
         return analysis
 
+    async def _analyze_backend_and_database(self, backend_path: str, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze the backend, then its datasource, storing the latter under analysis_result["database"]."""
+        backend = await self._analyze_backend(backend_path)
+        db_url = backend.get("database_config", {}).get("spring.datasource.url", "")
+        if db_url:
+            db_raw = await self._invoke_tool(detect_database_type, db_url)
+            analysis_result["database"] = msgspec.json.decode(db_raw)
+        return backend
+
+    async def _analyze_frontend(self, frontend_path: str) -> Dict[str, Any]:
+        """Analyze React frontend using Dedalus tools."""
+        frontend_raw = await self._invoke_tool(analyze_react_app, frontend_path)
+        return msgspec.json.decode(frontend_raw)
+
     async def _generate_recommendations(self, analysis: Dict[str, Any]) -> list[str]:
         """Use Dedalus REASONING model + Brave Search MCP for migration recommendations.
 
         This is a key handoff: the REASONING model analyzes the code structure
         while Brave Search MCP provides real-time best practices.
         """
+        # Identical analysis snapshots (re-runs on an unchanged repo) reuse the
+        # recommendations from the previous run
+        cache_file = self._recommendations_cache_file(
+            {key: analysis.get(key, {}) for key in ("backend", "frontend", "database")},
+        )
+        cached = self._load_cached_recommendations(cache_file)
+        if cached is not None:
+            return cached
+
         try:
             prompt = f"""Analyze this application structure and provide migration recommendations for GCP:
 
 Backend Analysis:
-{json.dumps(analysis.get('backend', {}), indent=2)}
+{json.dumps(_prompt_preview(analysis.get('backend', {})), separators=(',', ':'))}
 
 Frontend Analysis:
-{json.dumps(analysis.get('frontend', {}), indent=2)}
+{json.dumps(_prompt_preview(analysis.get('frontend', {})), separators=(',', ':'))}
 
 Database Analysis:
-{json.dumps(analysis.get('database', {}), indent=2)}
+{json.dumps(_prompt_preview(analysis.get('database', {})), separators=(',', ':'))}
 
 Provide 3-5 specific, actionable recommendations for migrating this application to Google Cloud Platform.
 Focus on: database migration strategy, container optimization for Cloud Run, frontend hosting best practices, configuration management, and security.
@@ -191,26 +240,28 @@ Format your response as a JSON array of strings."""
                 prompt=prompt,
                 # REASONING model for deep analysis + route to research model
                 model=[ModelRole.REASONING.value, ModelRole.PLANNING.value],
-                tools=ANALYSIS_TOOLS,
+                tools=get_tools("detect_database_type"),
                 mcp_servers=["windsor/brave-search-mcp"],
                 instructions="You are a cloud migration expert specializing in GCP. Use Brave Search to look up current best practices if needed.",
                 max_steps=5,
             )
 
             # Parse response
+            recommendations: list[str] = []
             try:
-                recommendations = json.loads(response)
-                if isinstance(recommendations, list):
-                    return recommendations
-            except json.JSONDecodeError:
-                lines = response.strip().split("\n")
-                return [
-                    line.strip()
-                    for line in lines
-                    if line.strip() and not line.strip().startswith("[") and not line.strip().startswith("]")
-                ][:5]
-
-            return []
+                parsed = msgspec.json.decode(response)
+                if isinstance(parsed, list):
+                    recommendations = parsed
+            except msgspec.DecodeError:
+                recommendations = list(islice(
+                    (s for line in response.splitlines() if (s := line.strip()) and not s.startswith(("[", "]"))),
+                    5,
+                ))
+
+            if recommendations:
+                self._store_cached_recommendations(cache_file, recommendations)
+
+            return recommendations
 
         except Exception as e:
             self.logger.warning(f"Could not generate AI recommendations: {str(e)}")
@@ -7,11 +7,60 @@ Handles database migration using:
 - MCP server (Brave Search) for researching database best practices
 """
 
-import json
-from typing import Any, Dict
+from itertools import islice
+from typing import Any, Dict, List, Tuple
+
+import msgspec
 
 from .base_agent import AgentResult, AgentStatus, BaseAgent, Event, EventType, ModelRole
-from .dedalus_tools import DATABASE_TOOLS, create_cloud_sql_instance, detect_database_type
+from .dedalus_tools import create_cloud_sql_instance, detect_database_type, get_tools
+
+
+# Static part of the recommendations request, sent as the system prompt so the
+# provider can cache it as a prefix. Keep per-run values out of it: they go in
+# the (short) user prompt.
+_RECOMMENDATION_INSTRUCTIONS = """You are a database migration expert specializing in cloud databases.
+
+Given a database configuration and migration strategy, provide 2-3 specific recommendations
+for data persistence, connection pooling, and security.
+
+Format your response as a JSON array of strings."""
+
+
+# Curated answers for the (type, mode, strategy) combinations detect_database_type
+# can produce; only combinations missing here go to the model
+_RECOMMENDATION_TABLE: Dict[Tuple[str, str, str], List[str]] = {
+    ("h2", "in-memory", "keep-h2"): [
+        "Seed required reference data at startup (data.sql or Flyway) since every instance starts empty",
+        "Set Cloud Run max instances to 1 so all requests see the same in-memory data",
+        "Disable the H2 web console (spring.h2.console.enabled=false) in the deployed service",
+    ],
+    ("h2", "file-based", "keep-h2"): [
+        "Treat the H2 file as disposable: Cloud Run's filesystem is in-memory and per instance",
+        "Set Cloud Run max instances to 1 to avoid diverging copies of the database file",
+        "Disable the H2 web console (spring.h2.console.enabled=false) in the deployed service",
+    ],
+    ("h2", "in-memory", "migrate-to-cloud-sql"): [
+        "Manage the schema with Flyway or Liquibase instead of spring.jpa.hibernate.ddl-auto",
+        "Size the HikariCP pool (spring.datasource.hikari.maximum-pool-size) to Cloud SQL connection limits divided by max instances",
+        "Connect through the Cloud SQL Java connector with IAM authentication instead of a public IP and password",
+    ],
+    ("h2", "file-based", "migrate-to-cloud-sql"): [
+        "Export existing H2 data (SCRIPT TO) and replay it into Cloud SQL before switching traffic",
+        "Size the HikariCP pool (spring.datasource.hikari.maximum-pool-size) to Cloud SQL connection limits divided by max instances",
+        "Connect through the Cloud SQL Java connector with IAM authentication instead of a public IP and password",
+    ],
+    ("mysql", "external", "migrate-to-cloud-sql"): [
+        "Use Database Migration Service for a continuous MySQL replication cutover with minimal downtime",
+        "Size the HikariCP pool (spring.datasource.hikari.maximum-pool-size) to Cloud SQL connection limits divided by max instances",
+        "Store database credentials in Secret Manager and mount them into Cloud Run",
+    ],
+    ("postgresql", "external", "migrate-to-cloud-sql"): [
+        "Use Database Migration Service for a continuous PostgreSQL replication cutover with minimal downtime",
+        "Size the HikariCP pool (spring.datasource.hikari.maximum-pool-size) to Cloud SQL connection limits divided by max instances",
+        "Store database credentials in Secret Manager and mount them into Cloud Run",
+    ],
+}
 
 
 class DatabaseMigrationAgent(BaseAgent):
@@ -22,6 +71,9 @@ class DatabaseMigrationAgent(BaseAgent):
     code generation (for SQL migration scripts).
     """
 
+    DEPENDS_ON = frozenset({EventType.ANALYSIS_COMPLETE, EventType.INFRASTRUCTURE_READY})
+    PUBLISHES = frozenset({EventType.DATABASE_MIGRATED})
+
     def __init__(self, event_bus, config: Dict[str, Any], dedalus_api_key: str):
         super().__init__(
             name="DatabaseMigration",
@@ -34,15 +86,15 @@ class DatabaseMigrationAgent(BaseAgent):
         """Execute database migration with multi-model handoffs."""
         self.logger.info("Starting database migration with Dedalus MULTI_MODEL routing")
 
-        analysis_events = self.event_bus.get_history(EventType.ANALYSIS_COMPLETE)
-        if not analysis_events:
+        analysis_event = self.event_bus.get_last(EventType.ANALYSIS_COMPLETE)
+        if analysis_event is None:
             return AgentResult(
                 status=AgentStatus.FAILED,
                 data={},
                 errors=["No code analysis results available"],
             )
 
-        analysis_data = analysis_events[-1].data
+        analysis_data = analysis_event.data
         db_info = analysis_data.get("database", {})
         db_strategy = self.config.get("gcp", {}).get("database", {}).get("strategy", "keep-h2")
 
@@ -153,7 +205,7 @@ class DatabaseMigrationAgent(BaseAgent):
             create_cloud_sql_instance,
             project_id, region, instance_name, database_name, tier, db_version,
         )
-        data = json.loads(raw)
+        data = msgspec.json.decode(raw)
 
         if not data.get("success"):
             return {
@@ -181,37 +233,51 @@ class DatabaseMigrationAgent(BaseAgent):
 
         Hands off between REASONING model (for analysis) and PLANNING model
         (for migration strategy), with Brave Search MCP for best practices.
+        Combinations in _RECOMMENDATION_TABLE are answered without a model call.
         """
-        try:
-            prompt = f"""Given this database configuration and migration strategy, provide 2-3 specific recommendations:
-
-Database Type: {db_info.get('type', 'unknown')}
-Database Mode: {db_info.get('mode', 'unknown')}
-Migration Strategy: {strategy}
+        combo = (db_info.get("type", "unknown"), db_info.get("mode", "unknown"), strategy)
+        force_regenerate = self.config.get("ai", {}).get("force_regenerate_recommendations", False)
+        if combo in _RECOMMENDATION_TABLE and not force_regenerate:
+            return list(_RECOMMENDATION_TABLE[combo])
+
+        # The prompt is fully determined by these three values, so an exact key
+        # serves every re-run of the same project without a model call
+        cache_file = self._recommendations_cache_file(list(combo))
+        cached = self._load_cached_recommendations(cache_file)
+        if cached is not None:
+            return cached
 
-Provide practical recommendations for data persistence, connection pooling, and security.
-Format your response as a JSON array of strings."""
+        try:
+            prompt = (
+                f"Database Type: {db_info.get('type', 'unknown')}\n"
+                f"Database Mode: {db_info.get('mode', 'unknown')}\n"
+                f"Migration Strategy: {strategy}"
+            )
 
             response = await self.run_with_dedalus(
                 prompt=prompt,
                 # Multi-model: reasoning for analysis, planning for recommendations
                 model=[ModelRole.REASONING.value, ModelRole.PLANNING.value],
-                tools=DATABASE_TOOLS,
+                tools=get_tools("detect_database_type"),
                 mcp_servers=["windsor/brave-search-mcp"],
-                instructions="You are a database migration expert specializing in cloud databases.",
+                instructions=_RECOMMENDATION_INSTRUCTIONS,
                 max_steps=5,
             )
 
+            recommendations: list[str] = []
             try:
-                recommendations = json.loads(response)
-                if isinstance(recommendations, list):
-                    return recommendations
-            except json.JSONDecodeError:
-                lines = response.strip().split("\n")
-                return [
-                    line.strip() for line in lines
-                    if line.strip() and not line.startswith("[") and not line.startswith("]")
-                ][:3]
+                parsed = msgspec.json.decode(response)
+                if isinstance(parsed, list):
+                    recommendations = parsed
+            except msgspec.DecodeError:
+                recommendations = list(islice(
+                    (s for line in response.splitlines() if (s := line.strip()) and not s.startswith(("[", "]"))),
+                    3,
+                ))
+
+            if recommendations:
+                self._store_cached_recommendations(cache_file, recommendations)
+            return recommendations
 
         except Exception as e:
             self.logger.warning(f"Could not get AI recommendations: {str(e)}")
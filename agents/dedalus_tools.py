@@ -7,49 +7,377 @@ schemas and let models invoke them during agentic loops.
 """
 
 import asyncio
+import hashlib
 import json
+import logging
 import os
 import re
+import shutil
+import threading
+import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict, deque
+from functools import wraps
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
+
+import msgspec
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    from google.api_core import exceptions as gcp_exceptions
+    from google.cloud import run_v2
+except ImportError:  # google-cloud-run not installed; deploy via the gcloud CLI only
+    gcp_exceptions = None
+    run_v2 = None
+
+logger = logging.getLogger(__name__)
+
+_json_encode = msgspec.json.Encoder().encode
+
+
+def _to_json(obj: Any) -> str:
+    """Serialize a tool result to compact JSON with msgspec's C encoder."""
+    return _json_encode(obj).decode()
 
 
 # ---------------------------------------------------------------------------
 # Shell helpers (not exposed as tools – used internally by tools)
 # ---------------------------------------------------------------------------
 
-async def _run_command(command: str, cwd: str | None = None, timeout: int = 300) -> dict[str, Any]:
-    """Run a shell command asynchronously and return result dict."""
+# Lines of stdout/stderr kept per command (older output is logged, then dropped)
+_OUTPUT_TAIL_LINES = 200
+# Streams are read in chunks of this size; a single line longer than
+# _MAX_LINE_BYTES (e.g. a progress bar redrawn with \r) keeps only its end
+_READ_CHUNK_BYTES = 64 * 1024
+_MAX_LINE_BYTES = 64 * 1024
+
+
+def _keep_line(line: bytes, tail: deque[str]) -> None:
+    text = line.decode(errors="replace").rstrip("\r")
+    logger.debug(text)
+    tail.append(text)
+
+
+async def _drain_stream(stream: asyncio.StreamReader, tail: deque[str]) -> None:
+    """Read a subprocess stream in chunks, keeping only the last lines.
+
+    Splitting lines here rather than iterating the StreamReader avoids its
+    64 KiB line limit, which otherwise fails the command on one long line.
+    """
+    pending = b""
+    while chunk := await stream.read(_READ_CHUNK_BYTES):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            _keep_line(line, tail)
+        if len(pending) > _MAX_LINE_BYTES:
+            pending = pending[-_MAX_LINE_BYTES:]
+    if pending:
+        _keep_line(pending, tail)
+
+
+async def _reap(process: asyncio.subprocess.Process) -> None:
+    """Kill a still-running child and wait for it, so no process is left behind."""
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+
+async def _run_command(
+    argv: list[str],
+    cwd: str | None = None,
+    timeout: int = 300,
+    env: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """Run a command (argv list, no shell) asynchronously and return result dict.
+
+    Output is streamed rather than buffered, so long docker/gcloud logs keep
+    memory flat; only the last _OUTPUT_TAIL_LINES lines of each stream are
+    returned. On timeout, error or cancellation the child is killed and reaped.
+    The executable is resolved on PATH first, so Windows .cmd shims such as
+    gcloud.cmd and npm.cmd run without a shell.
+    """
+    executable = shutil.which(argv[0], path=(env if env is not None else os.environ).get("PATH"))
+    if executable is None:
+        return {"returncode": 127, "stdout": "", "stderr": f"{argv[0]}: command not found on PATH"}
+
+    stdout_tail: deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+    stderr_tail: deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
     try:
-        process = await asyncio.create_subprocess_shell(
-            command,
+        process = await asyncio.create_subprocess_exec(
+            executable, *argv[1:],
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             cwd=cwd,
+            env=env,
+        )
+    except Exception as e:
+        return {"returncode": 1, "stdout": "", "stderr": str(e)}
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                _drain_stream(process.stdout, stdout_tail),
+                _drain_stream(process.stderr, stderr_tail),
+                process.wait(),
+            ),
+            timeout=timeout,
         )
-        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
-        return {
-            "returncode": process.returncode,
-            "stdout": stdout.decode() if stdout else "",
-            "stderr": stderr.decode() if stderr else "",
-        }
     except asyncio.TimeoutError:
-        process.kill()
-        return {"returncode": 1, "stdout": "", "stderr": f"Command timed out after {timeout}s: {command}"}
+        await _reap(process)
+        return {"returncode": 1, "stdout": "", "stderr": f"Command timed out after {timeout}s: {' '.join(argv)}"}
     except Exception as e:
+        await _reap(process)
         return {"returncode": 1, "stdout": "", "stderr": str(e)}
+    except asyncio.CancelledError:
+        await _reap(process)
+        raise
+    return {
+        "returncode": process.returncode,
+        "stdout": "\n".join(stdout_tail),
+        "stderr": "\n".join(stderr_tail),
+    }
 
 
-async def _run_gcloud(command: str) -> dict[str, Any]:
+async def _run_gcloud(args: list[str]) -> dict[str, Any]:
     """Run a gcloud CLI command."""
-    return await _run_command(f"gcloud {command}")
+    return await _run_command(["gcloud", *args])
+
+
+def _async_cached(ttl: float, cache_if: Callable[[Any], bool] = lambda value: value is not None):
+    """Memoize an async function per argument tuple for ttl seconds.
+
+    gcloud lookups cost a second or more each and their answers do not change
+    within a run. Concurrent callers with the same arguments share a single
+    call; results rejected by cache_if (failures, by default None) are
+    retried on the next call.
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        cache: dict[tuple, tuple[float, Any]] = {}
+        locks: dict[tuple, asyncio.Lock] = {}
+
+        @wraps(fn)
+        async def wrapper(*args: Any) -> Any:
+            hit = cache.get(args)
+            if hit is not None and hit[0] > time.monotonic():
+                return hit[1]
+            async with locks.setdefault(args, asyncio.Lock()):
+                hit = cache.get(args)
+                if hit is not None and hit[0] > time.monotonic():
+                    return hit[1]
+                value = await fn(*args)
+                if cache_if(value):
+                    cache[args] = (time.monotonic() + ttl, value)
+                return value
+
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+@_async_cached(ttl=300)
+async def _get_project_number(project_id: str) -> str | None:
+    """Return the numeric project number for project_id, or None on failure."""
+    r = await _run_gcloud(["projects", "describe", project_id, "--format=value(projectNumber)"])
+    if r["returncode"] != 0:
+        return None
+    return r["stdout"].strip() or None
+
+
+# Dependency, build-output and VCS directories never holding project sources
+_PRUNED_DIRS = frozenset({
+    "node_modules", "dist", "build", ".git", "target", ".next", ".cache", ".venv", "__pycache__",
+})
+
+
+def _iter_source_files(root: Path, suffixes: tuple[str, ...]) -> Iterator[str]:
+    """Yield paths of files under root ending in any of suffixes.
+
+    Uses a single os.scandir walk (no per-entry stat), so one traversal
+    serves every extension. Directories in _PRUNED_DIRS are not descended,
+    and unreadable directories are skipped, as with Path.rglob.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _PRUNED_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(suffixes) and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+
+def _iter_java_files(root: Path) -> Iterator[str]:
+    """Yield paths of .java files under root."""
+    return _iter_source_files(root, (".java",))
+
+
+# Files remembered per _cached_by_stat parser; least recently used go first,
+# so a long-lived process (the web backend) stays bounded
+_STAT_CACHE_ENTRIES = 4096
+
+
+def _cached_by_stat(fn: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Memoize a per-file parser on the (mtime_ns, size) signature of its path.
+
+    Re-analysing an unchanged tree skips the read and parse. Results are
+    shared between calls, so callers must not mutate them.
+    """
+    cache: OrderedDict[str, tuple[tuple[int, int], Any]] = OrderedDict()
+    lock = threading.Lock()
+
+    @wraps(fn)
+    def wrapper(path: str) -> Any:
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+        with lock:
+            hit = cache.get(path)
+            if hit is not None and hit[0] == signature:
+                cache.move_to_end(path)
+                return hit[1]
+        value = fn(path)
+        with lock:
+            cache[path] = (signature, value)
+            cache.move_to_end(path)
+            while len(cache) > _STAT_CACHE_ENTRIES:
+                cache.popitem(last=False)
+        return value
+
+    wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+    return wrapper
+
+
+# Larger "source" files are generated or vendored bundles; scanners skip them
+_MAX_SOURCE_BYTES = 2_000_000
+
+
+# Total bytes of source kept by _read_source_bytes; least recently used
+# files are evicted first, so a long-lived process stays bounded
+_SOURCE_CACHE_BYTES = 64 * 1024 * 1024
+_source_cache: OrderedDict[str, tuple[tuple[int, int], bytes]] = OrderedDict()
+_source_cache_size = 0
+_source_cache_lock = threading.Lock()
+
+
+def _read_source_bytes(path: str) -> bytes:
+    """Read a source file, reusing the bytes while its (mtime_ns, size) is unchanged.
+
+    Shared by the endpoint scan and the CORS rewrite, so deployment does not
+    re-read Java files the analysis just read. Files over _MAX_SOURCE_BYTES
+    read as empty.
+    """
+    global _source_cache_size
+    st = os.stat(path)
+    if st.st_size > _MAX_SOURCE_BYTES:
+        return b""
+    signature = (st.st_mtime_ns, st.st_size)
+    with _source_cache_lock:
+        hit = _source_cache.get(path)
+        if hit is not None and hit[0] == signature:
+            _source_cache.move_to_end(path)
+            return hit[1]
+
+    with open(path, "rb", buffering=0) as f:
+        data = f.read()
+
+    with _source_cache_lock:
+        old = _source_cache.pop(path, None)
+        if old is not None:
+            _source_cache_size -= len(old[1])
+        _source_cache[path] = (signature, data)
+        _source_cache_size += len(data)
+        while _source_cache_size > _SOURCE_CACHE_BYTES:
+            _, (_, evicted) = _source_cache.popitem(last=False)
+            _source_cache_size -= len(evicted)
+    return data
+
+
+def _clear_source_cache() -> None:
+    """Drop every cached source file."""
+    global _source_cache_size
+    with _source_cache_lock:
+        _source_cache.clear()
+        _source_cache_size = 0
+
+
+
+# Upper bound on files processed concurrently (keeps open FDs bounded);
+# reads are I/O-bound, so allow a few in flight per core
+_FILE_IO_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+
+
+async def _map_files_in_threads(
+    fn: Callable[..., Any], paths: Iterator[str], *args: Any, default: Any = None,
+) -> list[Any]:
+    """Run fn(path, *args) for every path in worker threads, results in input order.
+
+    The directory walk itself also runs off the event loop. A file that
+    cannot be read yields ``default`` instead of aborting the whole scan.
+    """
+    semaphore = asyncio.Semaphore(_FILE_IO_CONCURRENCY)
+    file_list = await asyncio.to_thread(list, paths)
+
+    async def _run(path: str) -> Any:
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(fn, path, *args)
+            except OSError as e:
+                logger.warning("Skipping unreadable file %s: %s", path, e)
+                return default
+
+    return await asyncio.gather(*(_run(path) for path in file_list))
 
 
 # ============================================================================
 # CODE ANALYSIS TOOLS
 # ============================================================================
 
+# Qualified pom.xml tags matched while streaming the POM
+_POM_NS = "{http://maven.apache.org/POM/4.0.0}"
+_POM_DEPENDENCY = _POM_NS + "dependency"
+_POM_ARTIFACT_ID = _POM_NS + "artifactId"
+_POM_JAVA_VERSION = _POM_NS + "java.version"
+_POM_PARENT = _POM_NS + "parent"
+_POM_VERSION = _POM_NS + "version"
+_POM_BUILD = _POM_NS + "build"
+
+# Patterns used by the analysis tools, compiled once at import
+_GRADLE_JAVA_VERSION_RE = re.compile(r"sourceCompatibility\s*=\s*['\"]?([\d.]+)")
+_GRADLE_DEP_RE = re.compile(r"implementation\s+['\"]([^'\"]+)['\"]")
+_REQUEST_MAPPING_RE = re.compile(r"@RequestMapping\([\"']([^\"']+)[\"']\)")
+# Every HTTP-method mapping in one alternation; the path is optional so bare
+# @GetMapping and value=/path= forms resolve to the class-level base path
+_ENDPOINT_RE = re.compile(
+    r"""@(Get|Post|Put|Delete|Patch)Mapping\b(?:\(\s*(?:(?:value|path)\s*=\s*)?["']([^"']*)["'])?"""
+)
+# Prefilter tokens: a bytes `in` per token (fast substring search in C) beats one
+# alternation regex pass, so multi-token checks are chained `in` tests
+_CONTROLLER_MARKERS = (b"@RestController", b"@Controller")
+# key=value lines of application.properties (comments and blank lines never match)
+_PROPERTY_RE = re.compile(r"^[ \t]*([^#\s=][^=\n]*)=(.*)$", re.MULTILINE)
+_DB_PROPERTY_PREFIXES = ("spring.datasource", "spring.h2", "spring.jpa")
+# (script substring, build tool) in detection priority order
+_BUILD_TOOL_MARKERS = (("vite", "vite"), ("react-scripts", "create-react-app"), ("webpack", "webpack"))
+_FRONTEND_SOURCE_SUFFIXES = (".js", ".jsx", ".ts", ".tsx")
+# Quoted http(s) URL; the class is printable ASCII minus both quote characters
+_URL_RE = re.compile(r"""['"](https?://[!#-&(-~]+)['"]""", re.ASCII)
+
+
 async def scan_maven_pom(backend_path: str) -> str:
     """Parse a Maven pom.xml to extract Java version, Spring Boot version, and dependencies.
 
@@ -60,34 +388,52 @@ async def scan_maven_pom(backend_path: str) -> str:
         JSON string with keys: java_version, spring_boot_version, dependencies.
     """
     pom_file = Path(backend_path) / "pom.xml"
-    result: dict[str, Any] = {"java_version": None, "spring_boot_version": None, "dependencies": []}
+    try:
+        # Parsing is CPU-bound; keep it off the loop so concurrent scans overlap
+        return await asyncio.to_thread(_scan_pom_file, str(pom_file))
+    except FileNotFoundError:
+        return _to_json({"error": f"pom.xml not found at {pom_file}"})
 
-    if not pom_file.exists():
-        return json.dumps({"error": f"pom.xml not found at {pom_file}"})
+
+@_cached_by_stat
+def _scan_pom_file(pom_file: str) -> str:
+    """Parse one pom.xml into the scan_maven_pom JSON result."""
+    result: dict[str, Any] = {"java_version": None, "spring_boot_version": None, "dependencies": []}
 
     try:
-        tree = ET.parse(pom_file)
-        root = tree.getroot()
-        ns = {"m": "http://maven.apache.org/POM/4.0.0"}
-
-        java_version = root.find(".//m:properties/m:java.version", ns)
-        if java_version is not None:
-            result["java_version"] = java_version.text
-
-        parent = root.find("m:parent", ns)
-        if parent is not None:
-            version = parent.find("m:version", ns)
-            if version is not None:
-                result["spring_boot_version"] = version.text
-
-        for dep in root.findall(".//m:dependency", ns):
-            artifact = dep.find("m:artifactId", ns)
-            if artifact is not None:
-                result["dependencies"].append(artifact.text)
+        # Single streaming pass; matched subtrees are cleared as we go. The
+        # <build> section (plugins and their own dependencies) holds nothing
+        # we report, so its elements are skipped. Maven allows <build> before
+        # <dependencies> and <profiles>, so parsing continues past it.
+        build_depth = 0
+        with open(pom_file, "rb") as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                tag = elem.tag
+                if tag == _POM_BUILD:
+                    if event == "start":
+                        build_depth += 1
+                    else:
+                        build_depth -= 1
+                        elem.clear()
+                    continue
+                if event == "start" or build_depth:
+                    continue
+                if tag == _POM_DEPENDENCY:
+                    artifact = elem.find(_POM_ARTIFACT_ID)
+                    if artifact is not None:
+                        result["dependencies"].append(artifact.text)
+                    elem.clear()
+                elif tag == _POM_JAVA_VERSION:
+                    result["java_version"] = elem.text
+                elif tag == _POM_PARENT:
+                    version = elem.find(_POM_VERSION)
+                    if version is not None:
+                        result["spring_boot_version"] = version.text
+                    elem.clear()
     except Exception as e:
         result["error"] = str(e)
 
-    return json.dumps(result)
+    return _to_json(result)
 
 
 async def scan_gradle_build(backend_path: str) -> str:
@@ -102,23 +448,24 @@ async def scan_gradle_build(backend_path: str) -> str:
     gradle_file = Path(backend_path) / "build.gradle"
     result: dict[str, Any] = {"java_version": None, "dependencies": []}
 
-    if not gradle_file.exists():
-        return json.dumps({"error": f"build.gradle not found at {gradle_file}"})
+    try:
+        content = gradle_file.read_text(encoding="utf-8", errors="ignore")
+    except FileNotFoundError:
+        return _to_json({"error": f"build.gradle not found at {gradle_file}"})
 
     try:
-        content = gradle_file.read_text()
-        match = re.search(r"sourceCompatibility\s*=\s*['\"]?([\d.]+)", content)
+        match = _GRADLE_JAVA_VERSION_RE.search(content)
         if match:
             result["java_version"] = match.group(1)
-        result["dependencies"] = re.findall(r"implementation\s+['\"]([^'\"]+)['\"]", content)
+        result["dependencies"] = _GRADLE_DEP_RE.findall(content)
     except Exception as e:
         result["error"] = str(e)
 
-    return json.dumps(result)
+    return _to_json(result)
 
 
 async def analyze_spring_properties(backend_path: str) -> str:
-    """Analyze Spring Boot application.properties or application.yml for database and server config.
+    """Analyze Spring Boot application.properties or application.yml/.yaml for database and server config.
 
     Args:
         backend_path: Absolute path to the backend directory.
@@ -130,24 +477,17 @@ async def analyze_spring_properties(backend_path: str) -> str:
     db_config: dict[str, str] = {}
     server_config: dict[str, str] = {}
 
-    props_file = base / "application.properties"
-    yml_file = base / "application.yml"
-
-    if props_file.exists():
-        content = props_file.read_text()
-        for line in content.split("\n"):
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key, value = key.strip(), value.strip()
-            if key.startswith("spring.datasource") or key.startswith("spring.h2") or key.startswith("spring.jpa"):
-                db_config[key] = value
-            elif key.startswith("server."):
-                server_config[key] = value
-    elif yml_file.exists():
-        import yaml
-        data = yaml.safe_load(yml_file.read_text())
+    # One directory listing answers every "which config file exists" question
+    try:
+        present = set(os.listdir(base))
+    except OSError:
+        present = set()
+    yml_name = next((name for name in ("application.yml", "application.yaml") if name in present), None)
+
+    if "application.properties" in present:
+        db_config, server_config = _parse_properties_file(str(base / "application.properties"))
+    elif yml_name:
+        data = yaml.load((base / yml_name).read_text(encoding="utf-8", errors="ignore"), Loader=_YamlLoader)
         if isinstance(data, dict) and "spring" in data:
             spring = data["spring"]
             if "datasource" in spring:
@@ -159,7 +499,41 @@ async def analyze_spring_properties(backend_path: str) -> str:
         if isinstance(data, dict) and "server" in data:
             server_config.update({f"server.{k}": str(v) for k, v in data["server"].items()})
 
-    return json.dumps({"database_config": db_config, "server_config": server_config})
+    return _to_json({"database_config": db_config, "server_config": server_config})
+
+
+@_cached_by_stat
+def _parse_properties_file(props_file: str) -> tuple[dict[str, str], dict[str, str]]:
+    """Split application.properties entries into (database_config, server_config)."""
+    db_config: dict[str, str] = {}
+    server_config: dict[str, str] = {}
+    content = Path(props_file).read_text(encoding="utf-8", errors="ignore")
+    for key, value in _PROPERTY_RE.findall(content):
+        key = key.strip()
+        if key.startswith(_DB_PROPERTY_PREFIXES):
+            db_config[key] = value.strip()
+        elif key.startswith("server."):
+            server_config[key] = value.strip()
+    return db_config, server_config
+
+
+# JDBC URL marker -> serialized detect_database_type result. The alternation
+# lists h2:mem: before h2: so in-memory URLs take the more specific branch.
+_DB_URL_RE = re.compile(r"h2:mem:|h2:|mysql|postgresql")
+_DB_TYPE_RESULTS: dict[str | None, str] = {
+    marker: _to_json({"type": db_type, "mode": mode, "migration_recommended": recommended, "notes": notes})
+    for marker, db_type, mode, recommended, notes in (
+        ("h2:mem:", "h2", "in-memory", True,
+         ["H2 in-memory database – data lost on restart. Recommend Cloud SQL."]),
+        ("h2:", "h2", "file-based", True,
+         ["H2 file-based – not persistent on Cloud Run. Consider Cloud SQL."]),
+        ("mysql", "mysql", "external", True,
+         ["MySQL detected. Can migrate to Cloud SQL MySQL."]),
+        ("postgresql", "postgresql", "external", True,
+         ["PostgreSQL detected. Can migrate to Cloud SQL PostgreSQL."]),
+        (None, "unknown", "unknown", False, []),
+    )
+}
 
 
 async def detect_database_type(datasource_url: str) -> str:
@@ -171,22 +545,8 @@ async def detect_database_type(datasource_url: str) -> str:
     Returns:
         JSON string with keys: type, mode, migration_recommended, notes.
     """
-    info: dict[str, Any] = {"type": "unknown", "mode": "unknown", "migration_recommended": False, "notes": []}
-
-    if "h2:mem:" in datasource_url:
-        info.update(type="h2", mode="in-memory", migration_recommended=True)
-        info["notes"].append("H2 in-memory database – data lost on restart. Recommend Cloud SQL.")
-    elif "h2:" in datasource_url:
-        info.update(type="h2", mode="file-based", migration_recommended=True)
-        info["notes"].append("H2 file-based – not persistent on Cloud Run. Consider Cloud SQL.")
-    elif "mysql" in datasource_url:
-        info.update(type="mysql", mode="external", migration_recommended=True)
-        info["notes"].append("MySQL detected. Can migrate to Cloud SQL MySQL.")
-    elif "postgresql" in datasource_url:
-        info.update(type="postgresql", mode="external", migration_recommended=True)
-        info["notes"].append("PostgreSQL detected. Can migrate to Cloud SQL PostgreSQL.")
-
-    return json.dumps(info)
+    match = _DB_URL_RE.search(datasource_url)
+    return _DB_TYPE_RESULTS[match.group(0) if match else None]
 
 
 async def extract_api_endpoints(backend_path: str) -> str:
@@ -199,37 +559,37 @@ async def extract_api_endpoints(backend_path: str) -> str:
         JSON string – list of {file, endpoints: [{method, path}]}.
     """
     src_java = Path(backend_path) / "src" / "main" / "java"
-    controllers: list[dict[str, Any]] = []
-
     if not src_java.exists():
-        return json.dumps([])
+        return _to_json([])
+
+    # Every file is checked: controllers may live in any package, and the
+    # marker prefilter makes non-controllers cheap to reject
+    results = await _map_files_in_threads(_scan_controller_file, _iter_java_files(src_java))
+    return _to_json([controller for controller in results if controller])
 
-    for java_file in src_java.rglob("*.java"):
-        content = java_file.read_text()
-        if "@RestController" not in content and "@Controller" not in content:
-            continue
 
-        endpoints: list[dict[str, str]] = []
-        base = ""
-        base_match = re.search(r"@RequestMapping\([\"']([^\"']+)[\"']\)", content)
-        if base_match:
-            base = base_match.group(1)
+@_cached_by_stat
+def _scan_controller_file(java_file: str) -> dict[str, Any] | None:
+    """Extract endpoint mappings from one Java file; None if it is not a controller."""
+    raw = _read_source_bytes(java_file)
+    # Most sources are not controllers: reject them before paying for decoding
+    if not any(marker in raw for marker in _CONTROLLER_MARKERS):
+        return None
+    content = raw.decode("utf-8", "ignore")
 
-        for pattern in [
-            r"@GetMapping\([\"']([^\"']+)[\"']\)",
-            r"@PostMapping\([\"']([^\"']+)[\"']\)",
-            r"@PutMapping\([\"']([^\"']+)[\"']\)",
-            r"@DeleteMapping\([\"']([^\"']+)[\"']\)",
-            r"@PatchMapping\([\"']([^\"']+)[\"']\)",
-        ]:
-            method = pattern.split("@")[1].split("Mapping")[0].upper()
-            for m in re.findall(pattern, content):
-                endpoints.append({"method": method, "path": base + m})
+    endpoints: list[dict[str, str]] = []
+    base = ""
+    base_match = _REQUEST_MAPPING_RE.search(content)
+    if base_match:
+        base = base_match.group(1)
 
-        if endpoints:
-            controllers.append({"file": str(java_file), "endpoints": endpoints})
+    # One scan over the file for every HTTP method, in source order
+    for method, path in _ENDPOINT_RE.findall(content):
+        endpoints.append({"method": method.upper(), "path": base + path or "/"})
 
-    return json.dumps(controllers)
+    if not endpoints:
+        return None
+    return {"file": java_file, "endpoints": endpoints}
 
 
 async def analyze_react_app(frontend_path: str) -> str:
@@ -244,51 +604,72 @@ async def analyze_react_app(frontend_path: str) -> str:
     fp = Path(frontend_path)
     analysis: dict[str, Any] = {"build_tool": None, "react_version": None, "dependencies": [], "api_endpoints": []}
 
-    pkg = fp / "package.json"
-    if pkg.exists():
-        data = json.loads(pkg.read_text())
+    try:
+        package_json = (fp / "package.json").read_bytes()
+    except FileNotFoundError:
+        package_json = None
+    if package_json is not None:
+        data = msgspec.json.decode(package_json)
         deps = data.get("dependencies", {})
         analysis["react_version"] = deps.get("react")
         analysis["dependencies"] = list(deps.keys())
-        scripts = str(data.get("scripts", {}))
-        if "vite" in scripts:
-            analysis["build_tool"] = "vite"
-        elif "react-scripts" in scripts:
-            analysis["build_tool"] = "create-react-app"
-        elif "webpack" in scripts:
-            analysis["build_tool"] = "webpack"
-
-    # Find hardcoded API URLs
+        scripts = " ".join(data.get("scripts", {}).values())
+        analysis["build_tool"] = next(
+            (tool for marker, tool in _BUILD_TOOL_MARKERS if marker in scripts), None,
+        )
+
+    # Find hardcoded API URLs; app code normally lives under src/, so the whole
+    # project (minus pruned dependency/build dirs) is walked only without one
     src = fp / "src"
-    if src.exists():
-        endpoints: set[str] = set()
-        for ext in ("*.js", "*.jsx", "*.ts", "*.tsx"):
-            for f in src.rglob(ext):
-                content = f.read_text()
-                urls = re.findall(r"['\"]https?://[^'\"]+['\"]|['\"]http://localhost:\d+['\"]", content)
-                endpoints.update(url.strip("'\"") for url in urls)
-        analysis["api_endpoints"] = list(endpoints)
+    if not src.is_dir():
+        src = fp
+    if src.is_dir():
+        per_file = await _map_files_in_threads(
+            _scan_frontend_urls, _iter_source_files(src, _FRONTEND_SOURCE_SUFFIXES), default=(),
+        )
+        # First-seen order (dicts dedupe like a set but keep insertion order), so
+        # the result is stable across runs and hash seeds
+        analysis["api_endpoints"] = list(dict.fromkeys(chain.from_iterable(per_file)))
 
-    return json.dumps(analysis)
+    return _to_json(analysis)
+
+
+@_cached_by_stat
+def _scan_frontend_urls(source_file: str) -> list[str]:
+    """Return the hardcoded http(s) URLs found in one frontend source file."""
+    with open(source_file, "rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size > _MAX_SOURCE_BYTES:
+            return []
+        raw = f.read()
+    # Most modules hold no literal URL: skip the decode and regex for them
+    if b"http" not in raw:
+        return []
+    return _URL_RE.findall(raw.decode("utf-8", "ignore"))
 
 
 # ============================================================================
 # GCP INFRASTRUCTURE TOOLS
 # ============================================================================
 
+@_async_cached(ttl=300, cache_if=lambda status: status["authenticated"])
+async def _gcloud_auth_status() -> dict[str, Any]:
+    """Probe gcloud installation and auth; only authenticated results are cached."""
+    version = await _run_command(["gcloud", "--version"])
+    if version["returncode"] != 0:
+        return {"installed": False, "authenticated": False, "active_account": None}
+
+    auth = await _run_command(["gcloud", "auth", "list"])
+    authenticated = auth["returncode"] == 0 and ("*" in auth["stdout"] or "ACTIVE" in auth["stdout"])
+    return {"installed": True, "authenticated": authenticated, "active_account": auth["stdout"][:200]}
+
+
 async def check_gcloud_auth() -> str:
     """Check if the gcloud CLI is installed and authenticated.
 
     Returns:
         JSON string with keys: installed, authenticated, active_account.
     """
-    version = await _run_command("gcloud --version")
-    if version["returncode"] != 0:
-        return json.dumps({"installed": False, "authenticated": False, "active_account": None})
-
-    auth = await _run_command("gcloud auth list")
-    authenticated = auth["returncode"] == 0 and ("*" in auth["stdout"] or "ACTIVE" in auth["stdout"])
-    return json.dumps({"installed": True, "authenticated": authenticated, "active_account": auth["stdout"][:200]})
+    return _to_json(await _gcloud_auth_status())
 
 
 async def enable_gcp_apis(project_id: str, apis: list[str]) -> str:
@@ -301,11 +682,23 @@ async def enable_gcp_apis(project_id: str, apis: list[str]) -> str:
     Returns:
         JSON string with per-API status.
     """
-    results: dict[str, str] = {}
-    for api in apis:
-        r = await _run_gcloud(f"services enable {api} --project={project_id}")
-        results[api] = "enabled" if r["returncode"] == 0 else f"failed: {r['stderr'][:200]}"
-    return json.dumps(results)
+    if not apis:
+        return _to_json({})
+
+    # One gcloud process enables every API; only a failed batch is retried per
+    # API (concurrently) to find out which ones failed
+    r = await _run_gcloud(["services", "enable", *apis, f"--project={project_id}"])
+    if r["returncode"] == 0:
+        return _to_json({api: "enabled" for api in apis})
+
+    per_api = await asyncio.gather(*(
+        _run_gcloud(["services", "enable", api, f"--project={project_id}"]) for api in apis
+    ))
+    results = {
+        api: "enabled" if r["returncode"] == 0 else f"failed: {r['stderr'][:200]}"
+        for api, r in zip(apis, per_api)
+    }
+    return _to_json(results)
 
 
 async def create_artifact_registry(project_id: str, region: str, repo_name: str) -> str:
@@ -319,18 +712,18 @@ async def create_artifact_registry(project_id: str, region: str, repo_name: str)
     Returns:
         JSON string with repository_url and status.
     """
-    check = await _run_gcloud(f"artifacts repositories describe {repo_name} --location={region}")
+    check = await _run_gcloud(["artifacts", "repositories", "describe", repo_name, f"--location={region}"])
     if check["returncode"] != 0:
-        create = await _run_gcloud(
-            f"artifacts repositories create {repo_name} "
-            f"--repository-format=docker --location={region} "
-            f"--description='Cloudify migrated images' --project={project_id}"
-        )
+        create = await _run_gcloud([
+            "artifacts", "repositories", "create", repo_name,
+            "--repository-format=docker", f"--location={region}",
+            "--description=Cloudify migrated images", f"--project={project_id}",
+        ])
         if create["returncode"] != 0:
-            return json.dumps({"success": False, "error": create["stderr"][:300]})
+            return _to_json({"success": False, "error": create["stderr"][:300]})
 
     url = f"{region}-docker.pkg.dev/{project_id}/{repo_name}"
-    return json.dumps({"success": True, "repository_url": url})
+    return _to_json({"success": True, "repository_url": url})
 
 
 async def setup_firebase_project(project_id: str) -> str:
@@ -342,10 +735,10 @@ async def setup_firebase_project(project_id: str) -> str:
     Returns:
         JSON string with status and hosting_site.
     """
-    check = await _run_command("firebase --version")
+    check = await _run_command(["firebase", "--version"])
     if check["returncode"] != 0:
-        return json.dumps({"success": False, "error": "Firebase CLI not installed. Run: npm install -g firebase-tools"})
-    return json.dumps({"success": True, "hosting_site": f"{project_id}.web.app"})
+        return _to_json({"success": False, "error": "Firebase CLI not installed. Run: npm install -g firebase-tools"})
+    return _to_json({"success": True, "hosting_site": f"{project_id}.web.app"})
 
 
 async def configure_iam_permissions(project_id: str) -> str:
@@ -357,21 +750,20 @@ async def configure_iam_permissions(project_id: str) -> str:
     Returns:
         JSON string with project_number, service_account, roles_granted.
     """
-    r = await _run_gcloud(f"projects describe {project_id} --format='value(projectNumber)'")
-    if r["returncode"] != 0:
-        return json.dumps({"success": False, "error": "Could not get project number"})
+    project_number = await _get_project_number(project_id)
+    if project_number is None:
+        return _to_json({"success": False, "error": "Could not get project number"})
 
-    project_number = r["stdout"].strip()
     sa = f"{project_number}@cloudbuild.gserviceaccount.com"
     roles = ["roles/run.admin", "roles/iam.serviceAccountUser"]
 
     for role in roles:
-        await _run_gcloud(
-            f"projects add-iam-policy-binding {project_id} "
-            f"--member=serviceAccount:{sa} --role={role}"
-        )
+        await _run_gcloud([
+            "projects", "add-iam-policy-binding", project_id,
+            f"--member=serviceAccount:{sa}", f"--role={role}",
+        ])
 
-    return json.dumps({"success": True, "project_number": project_number, "service_account": sa, "roles_granted": roles})
+    return _to_json({"success": True, "project_number": project_number, "service_account": sa, "roles_granted": roles})
 
 
 # ============================================================================
@@ -399,26 +791,26 @@ async def create_cloud_sql_instance(
     Returns:
         JSON string with connection_name and status.
     """
-    create = await _run_command(
-        f"gcloud sql instances create {instance_name} "
-        f"--database-version={db_version} --tier={tier} "
-        f"--region={region} --project={project_id}"
-    )
+    create = await _run_gcloud([
+        "sql", "instances", "create", instance_name,
+        f"--database-version={db_version}", f"--tier={tier}",
+        f"--region={region}", f"--project={project_id}",
+    ])
     if create["returncode"] != 0 and "already exists" not in create["stderr"]:
-        return json.dumps({"success": False, "error": create["stderr"][:300]})
+        return _to_json({"success": False, "error": create["stderr"][:300]})
 
-    await _run_command(
-        f"gcloud sql databases create {database_name} "
-        f"--instance={instance_name} --project={project_id}"
-    )
+    await _run_gcloud([
+        "sql", "databases", "create", database_name,
+        f"--instance={instance_name}", f"--project={project_id}",
+    ])
 
-    conn = await _run_command(
-        f"gcloud sql instances describe {instance_name} "
-        f"--project={project_id} --format='value(connectionName)'"
-    )
+    conn = await _run_gcloud([
+        "sql", "instances", "describe", instance_name,
+        f"--project={project_id}", "--format=value(connectionName)",
+    ])
     connection_name = conn["stdout"].strip() if conn["returncode"] == 0 else ""
 
-    return json.dumps({
+    return _to_json({
         "success": True,
         "instance_name": instance_name,
         "database_name": database_name,
@@ -442,24 +834,27 @@ async def write_dockerfile(backend_path: str, content: str) -> str:
     """
     try:
         path = Path(backend_path) / "Dockerfile"
-        cleaned = _clean_dockerfile_content(content)
+        cleaned = clean_dockerfile_content(content)
         if not cleaned:
-            return json.dumps({"success": False, "error": "No valid Dockerfile instructions found in generated content"})
+            return _to_json({"success": False, "error": "No valid Dockerfile instructions found in generated content"})
         path.write_text(cleaned)
-        return json.dumps({"success": True, "path": str(path)})
+        return _to_json({"success": True, "path": str(path)})
     except Exception as e:
-        return json.dumps({"success": False, "error": str(e)})
+        return _to_json({"success": False, "error": str(e)})
 
 
 # Valid Dockerfile instruction keywords (must appear at start of a line)
-_DOCKERFILE_INSTRUCTIONS = frozenset({
+_DOCKERFILE_KEYWORDS = frozenset({
     "FROM", "RUN", "CMD", "LABEL", "MAINTAINER", "EXPOSE", "ENV", "ADD",
     "COPY", "ENTRYPOINT", "VOLUME", "USER", "WORKDIR", "ARG", "ONBUILD",
     "STOPSIGNAL", "HEALTHCHECK", "SHELL",
 })
 
+# Markdown code fence (```dockerfile ... ```) around LLM-generated content
+_FENCED_BLOCK_RE = re.compile(r"```[\w]*\n(.*?)```", re.DOTALL)
+
 
-def _clean_dockerfile_content(content: str) -> str:
+def clean_dockerfile_content(content: str) -> str:
     """Extract valid Dockerfile content from an LLM response.
 
     Strips markdown fences, explanatory prose before/after the Dockerfile,
@@ -469,7 +864,7 @@ def _clean_dockerfile_content(content: str) -> str:
 
     # Strip markdown code fences (```dockerfile ... ```)
     if "```" in text:
-        blocks = re.findall(r"```[\w]*\n(.*?)```", text, re.DOTALL)
+        blocks = _FENCED_BLOCK_RE.findall(text)
         if blocks:
             # Use the longest fenced block (most likely the Dockerfile)
             text = max(blocks, key=len).strip()
@@ -480,7 +875,7 @@ def _clean_dockerfile_content(content: str) -> str:
     start_idx = None
     for i, line in enumerate(lines):
         first_word = line.split()[0] if line.strip() else ""
-        if first_word in _DOCKERFILE_INSTRUCTIONS:
+        if first_word in _DOCKERFILE_KEYWORDS:
             start_idx = i
             break
 
@@ -502,7 +897,7 @@ def _clean_dockerfile_content(content: str) -> str:
             continue
         first_word = stripped.split()[0] if stripped else ""
         if (
-            first_word in _DOCKERFILE_INSTRUCTIONS
+            first_word in _DOCKERFILE_KEYWORDS
             or stripped.startswith("#")
             or stripped.startswith("&&")
             or stripped.startswith("||")
@@ -523,20 +918,139 @@ def _clean_dockerfile_content(content: str) -> str:
     return "\n".join(lines[start_idx : end_idx + 1]).strip()
 
 
-async def build_docker_image(backend_path: str, image_tag: str) -> str:
+# OCI label carrying the backend source fingerprint of a built image
+_FINGERPRINT_LABEL = "cloudify.fingerprint"
+
+
+def _compute_source_fingerprint(backend_path: str) -> str:
+    """Hash the backend tree by (relative path, size, mtime) plus Dockerfile content.
+
+    The Dockerfile is hashed by content because it is rewritten on every
+    deployment, which would otherwise change its mtime on each run. Raises
+    OSError if any directory is unreadable: a partial fingerprint could
+    match a stale image and wrongly skip the rebuild.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    root = os.path.abspath(backend_path)
+    stack = [root]
+    entries: list[tuple[str, int, int]] = []
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != ".git":
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    rel = os.path.relpath(entry.path, root)
+                    if rel == "Dockerfile":
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                    entries.append((rel, st.st_size, st.st_mtime_ns))
+    for rel, size, mtime_ns in sorted(entries):
+        digest.update(f"{rel}\0{size}\0{mtime_ns}\n".encode())
+    dockerfile = Path(root) / "Dockerfile"
+    if dockerfile.exists():
+        digest.update(dockerfile.read_bytes())
+    return digest.hexdigest()
+
+
+async def fingerprint_backend_source(backend_path: str) -> str:
+    """Compute a fast fingerprint of the backend source tree for build caching.
+
+    Args:
+        backend_path: Absolute path to the backend directory.
+
+    Returns:
+        JSON string with the fingerprint hex digest.
+    """
+    try:
+        fingerprint = await asyncio.to_thread(_compute_source_fingerprint, backend_path)
+        return _to_json({"success": True, "fingerprint": fingerprint})
+    except OSError as e:
+        # No fingerprint means no skip: the caller falls back to a fresh build
+        logger.info(f"Cannot fingerprint {backend_path}, image will be rebuilt: {e}")
+        return _to_json({"success": False, "error": str(e)})
+    except Exception as e:
+        return _to_json({"success": False, "error": str(e)})
+
+
+async def get_image_fingerprint(image_tag: str) -> str:
+    """Read the source fingerprint label of an image already in the registry.
+
+    Args:
+        image_tag: Full image tag to inspect.
+
+    Returns:
+        JSON string with fingerprint (null if the image or label is missing).
+    """
+    r = await _run_command([
+        "docker", "buildx", "imagetools", "inspect", image_tag,
+        "--format", f'{{{{ index .Image.Config.Labels "{_FINGERPRINT_LABEL}" }}}}',
+    ])
+    fingerprint = r["stdout"].strip() if r["returncode"] == 0 else ""
+    if fingerprint in ("", "<no value>"):
+        fingerprint = None
+    return _to_json({"fingerprint": fingerprint})
+
+
+def _buildkit_env() -> dict[str, str]:
+    """Environment for docker builds with BuildKit enabled."""
+    return {**os.environ, "DOCKER_BUILDKIT": "1"}
+
+
+async def build_docker_image(backend_path: str, image_tag: str, fingerprint: str = "") -> str:
     """Build a Docker image for linux/amd64 (required by Cloud Run).
 
+    BuildKit reuses layers from the previously pushed image_tag, whose
+    inline cache metadata is embedded at build time.
+
     Args:
         backend_path: Absolute path to the backend directory with Dockerfile.
         image_tag: Full image tag (e.g. us-central1-docker.pkg.dev/proj/repo/svc:latest).
+        fingerprint: Optional source fingerprint stored as an image label.
 
     Returns:
         JSON string with success status.
     """
-    r = await _run_command(f"docker build --platform linux/amd64 -t {image_tag} {backend_path}")
+    argv = [
+        "docker", "build", "--platform", "linux/amd64", "-t", image_tag,
+        "--cache-from", image_tag, "--build-arg", "BUILDKIT_INLINE_CACHE=1",
+    ]
+    if fingerprint:
+        argv += ["--label", f"{_FINGERPRINT_LABEL}={fingerprint}"]
+    r = await _run_command([*argv, backend_path], env=_buildkit_env())
     if r["returncode"] == 0:
-        return json.dumps({"success": True})
-    return json.dumps({"success": False, "error": r["stderr"][:500]})
+        return _to_json({"success": True})
+    return _to_json({"success": False, "error": r["stderr"][:500]})
+
+
+# Artifact Registry hosts already wired to the gcloud Docker credential helper
+_configured_docker_hosts: set[str] = set()
+
+
+def _docker_credential_helper_configured(registry_host: str) -> bool:
+    """Check ~/.docker/config.json for a gcloud credHelpers entry for the host."""
+    config_file = Path.home() / ".docker" / "config.json"
+    try:
+        cred_helpers = json.loads(config_file.read_text()).get("credHelpers", {})
+    except (OSError, ValueError):
+        return False
+    return cred_helpers.get(registry_host) == "gcloud"
+
+
+async def _ensure_docker_auth(image_tag: str) -> None:
+    """Configure the gcloud Docker credential helper for the image's registry once."""
+    region = image_tag.split("-docker")[0]
+    registry_host = f"{region}-docker.pkg.dev"
+    if registry_host in _configured_docker_hosts:
+        return
+    if not _docker_credential_helper_configured(registry_host):
+        r = await _run_gcloud(["auth", "configure-docker", registry_host, "--quiet"])
+        if r["returncode"] != 0:
+            # Not recorded, so the next push retries the configuration
+            logger.warning(f"gcloud auth configure-docker {registry_host} failed: {r['stderr'][:200]}")
+            return
+    _configured_docker_hosts.add(registry_host)
 
 
 async def push_docker_image(image_tag: str) -> str:
@@ -548,12 +1062,126 @@ async def push_docker_image(image_tag: str) -> str:
     Returns:
         JSON string with success status.
     """
-    region = image_tag.split("-docker")[0]
-    await _run_command(f"gcloud auth configure-docker {region}-docker.pkg.dev --quiet")
-    r = await _run_command(f"docker push {image_tag}")
+    await _ensure_docker_auth(image_tag)
+    r = await _run_command(["docker", "push", image_tag])
+    if r["returncode"] == 0:
+        return _to_json({"success": True})
+    return _to_json({"success": False, "error": r["stderr"][:500]})
+
+
+# Result of probing `docker buildx inspect` (None until first checked)
+_buildx_available: bool | None = None
+
+
+async def check_docker_buildx() -> str:
+    """Check whether docker buildx has a usable builder (probed once per process).
+
+    When available, build and push run as one pipelined
+    ``buildx build --push`` (registry output, no local image store); otherwise
+    callers fall back to ``docker build`` followed by ``docker push``.
+
+    Returns:
+        JSON string with key: available.
+    """
+    global _buildx_available
+    if _buildx_available is None:
+        r = await _run_command(["docker", "buildx", "inspect"])
+        _buildx_available = r["returncode"] == 0
+    return _to_json({"available": _buildx_available})
+
+
+async def build_and_push_docker_image(backend_path: str, image_tag: str, fingerprint: str = "") -> str:
+    """Build a linux/amd64 image and stream its layers straight to Artifact Registry.
+
+    Uses ``docker buildx build --push`` so layers are uploaded as they are
+    produced instead of being stored locally and re-read by ``docker push``.
+    Layer cache rides inline in the pushed image and is restored from it on
+    the next build.
+
+    Args:
+        backend_path: Absolute path to the backend directory with Dockerfile.
+        image_tag: Full image tag to build and push.
+        fingerprint: Optional source fingerprint stored as an image label.
+
+    Returns:
+        JSON string with success status.
+    """
+    await _ensure_docker_auth(image_tag)
+    argv = [
+        "docker", "buildx", "build", "--platform", "linux/amd64", "--push", "-t", image_tag,
+        f"--cache-from=type=registry,ref={image_tag}", "--cache-to=type=inline",
+    ]
+    if fingerprint:
+        argv += ["--label", f"{_FINGERPRINT_LABEL}={fingerprint}"]
+    r = await _run_command([*argv, backend_path], env=_buildkit_env())
     if r["returncode"] == 0:
-        return json.dumps({"success": True})
-    return json.dumps({"success": False, "error": r["stderr"][:500]})
+        return _to_json({"success": True})
+    return _to_json({"success": False, "error": r["stderr"][:500]})
+
+
+# Process-wide Cloud Run API client, created on first use (keeps its channel open)
+_run_client: Any = None
+
+
+def _get_run_client() -> Any:
+    """Return the shared Cloud Run ServicesAsyncClient."""
+    global _run_client
+    if _run_client is None:
+        _run_client = run_v2.ServicesAsyncClient()
+    return _run_client
+
+
+async def _deploy_with_run_api(
+    project_id: str,
+    region: str,
+    service_name: str,
+    image_tag: str,
+    port: int,
+    memory: str,
+    cpu: str,
+    min_instances: int,
+    max_instances: int,
+    env_vars: dict[str, str],
+    allow_unauthenticated: bool,
+) -> str:
+    """Create or update a Cloud Run service through the REST/gRPC API and return its URL.
+
+    Avoids the gcloud interpreter start-up and OAuth refresh on every call.
+    """
+    client = _get_run_client()
+    parent = f"projects/{project_id}/locations/{region}"
+    name = f"{parent}/services/{service_name}"
+    service = run_v2.Service(
+        template=run_v2.RevisionTemplate(
+            containers=[run_v2.Container(
+                image=image_tag,
+                ports=[run_v2.ContainerPort(container_port=port)],
+                resources=run_v2.ResourceRequirements(limits={"cpu": cpu, "memory": memory}),
+                env=[run_v2.EnvVar(name=k, value=str(v)) for k, v in env_vars.items()],
+            )],
+            scaling=run_v2.RevisionScaling(
+                min_instance_count=min_instances,
+                max_instance_count=max_instances,
+            ),
+        ),
+    )
+
+    try:
+        await client.get_service(name=name)
+    except gcp_exceptions.NotFound:
+        operation = await client.create_service(parent=parent, service=service, service_id=service_name)
+    else:
+        service.name = name
+        operation = await client.update_service(service=service)
+    deployed = await operation.result()
+
+    if allow_unauthenticated:
+        policy = await client.get_iam_policy(request={"resource": name})
+        if not any(b.role == "roles/run.invoker" and "allUsers" in b.members for b in policy.bindings):
+            policy.bindings.add(role="roles/run.invoker", members=["allUsers"])
+            await client.set_iam_policy(request={"resource": name, "policy": policy})
+
+    return deployed.uri
 
 
 async def deploy_to_cloud_run(
@@ -571,6 +1199,9 @@ async def deploy_to_cloud_run(
 ) -> str:
     """Deploy a Docker image to Google Cloud Run.
 
+    Uses the Cloud Run API client when google-cloud-run is installed and
+    falls back to ``gcloud run deploy`` otherwise.
+
     Args:
         project_id: GCP project ID.
         region: GCP region.
@@ -587,12 +1218,22 @@ async def deploy_to_cloud_run(
     Returns:
         JSON string with success status and service_url.
     """
+    if run_v2 is not None:
+        try:
+            service_url = await _deploy_with_run_api(
+                project_id, region, service_name, image_tag, port, memory, cpu,
+                min_instances, max_instances, env_vars, allow_unauthenticated,
+            )
+            return _to_json({"success": True, "service_url": service_url})
+        except Exception as e:
+            logger.warning(f"Cloud Run API deploy failed, falling back to gcloud CLI: {e}")
+
     cmd_parts = [
-        f"gcloud run deploy {service_name}",
+        "run", "deploy", service_name,
         f"--image={image_tag}",
         f"--region={region}",
         f"--project={project_id}",
-        f"--platform=managed",
+        "--platform=managed",
         f"--port={port}",
         f"--memory={memory}",
         f"--cpu={cpu}",
@@ -604,19 +1245,77 @@ async def deploy_to_cloud_run(
         cmd_parts.append(f"--set-env-vars={env_str}")
     if allow_unauthenticated:
         cmd_parts.append("--allow-unauthenticated")
+    cmd_parts += ["--format=value(status.url)", "--quiet"]
 
-    r = await _run_command(" ".join(cmd_parts))
+    r = await _run_gcloud(cmd_parts)
     if r["returncode"] != 0:
-        return json.dumps({"success": False, "error": r["stderr"][:500]})
-
-    # Get service URL
-    url_result = await _run_gcloud(
-        f"run services describe {service_name} --region={region} "
-        f"--project={project_id} --format='value(status.url)'"
-    )
-    service_url = url_result["stdout"].strip() if url_result["returncode"] == 0 else f"https://{service_name}-<hash>.run.app"
-
-    return json.dumps({"success": True, "service_url": service_url})
+        return _to_json({"success": False, "error": r["stderr"][:500]})
+
+    # The deploy output already carries the URL; only describe the service if it is missing
+    output_lines = r["stdout"].strip().splitlines()
+    service_url = output_lines[-1].strip() if output_lines else ""
+    if not service_url.startswith("https://"):
+        url_result = await _run_gcloud([
+            "run", "services", "describe", service_name, f"--region={region}",
+            f"--project={project_id}", "--format=value(status.url)",
+        ])
+        service_url = url_result["stdout"].strip() if url_result["returncode"] == 0 else f"https://{service_name}-<hash>.run.app"
+
+    return _to_json({"success": True, "service_url": service_url})
+
+
+# CORS origin sites rewritten by update_cors_origins, one alternative per form:
+#   .allowedOrigins(...)  |  @CrossOrigin(origins = {...})  |  @CrossOrigin(origins = "...")
+# Matched on raw bytes: every token is ASCII, so UTF-8 sources need no decoding.
+_CORS_RE = re.compile(
+    rb'(?P<allowed>\.allowedOrigins\()(?P<allowed_args>[^)]+)\)'
+    rb'|(?P<xset>@CrossOrigin\(origins\s*=\s*\{)(?P<xset_args>[^}]+)\}'
+    rb'|(?P<xsingle>@CrossOrigin\(origins\s*=\s*)"(?P<xsingle_arg>[^"]+)"'
+)
+_CORS_MARKERS = (b".allowedOrigins(", b"@CrossOrigin")
+
+
+def _rewrite_cors_in_file(java_file: str, frontend_url: bytes, addition: bytes) -> bool:
+    """Add frontend_url to every CORS origins site of one Java file.
+
+    ``addition`` is the precomputed ``, "<frontend_url>"`` suffix appended to
+    each origins list. Returns True if the file already allows, or now
+    allows, the frontend URL.
+    """
+    content = _read_source_bytes(java_file)
+    # Bytes-level prefilter: most sources have no CORS config and are never decoded or regex-scanned
+    if not any(marker in content for marker in _CORS_MARKERS):
+        return False
+    if frontend_url in content:
+        return True
+
+    edits: list[tuple[int, int, bytes]] = []
+    for match in _CORS_RE.finditer(content):
+        if match.group("allowed"):
+            args = match.group("allowed_args")
+            edits.append((match.start("allowed_args"), match.end("allowed_args"), args.rstrip() + addition))
+        elif match.group("xset"):
+            args = match.group("xset_args")
+            edits.append((match.start("xset_args"), match.end("xset_args"), args.rstrip() + addition))
+        else:
+            orig = match.group("xsingle_arg")
+            edits.append((match.start(), match.end(), match.group("xsingle") + b'{"' + orig + b'"' + addition + b"}"))
+
+    if not edits:
+        return False
+
+    # finditer yields non-overlapping spans in order, so one join over the
+    # alternating untouched/replaced slices copies the file exactly once
+    parts: list[bytes] = []
+    last = 0
+    for start, end, replacement in edits:
+        parts.append(content[last:start])
+        parts.append(replacement)
+        last = end
+    parts.append(content[last:])
+    with open(java_file, "wb") as f:
+        f.write(b"".join(parts))
+    return True
 
 
 async def update_cors_origins(backend_path: str, frontend_url: str) -> str:
@@ -631,45 +1330,16 @@ async def update_cors_origins(backend_path: str, frontend_url: str) -> str:
     """
     src_java = Path(backend_path) / "src" / "main" / "java"
     if not src_java.exists():
-        return json.dumps({"success": False, "error": "No Java source directory found"})
-
-    files_updated = 0
-    for java_file in src_java.rglob("*.java"):
-        content = java_file.read_text()
-        if ".allowedOrigins(" not in content and "@CrossOrigin" not in content:
-            continue
-        if frontend_url in content:
-            files_updated += 1
-            continue
+        return _to_json({"success": False, "error": "No Java source directory found"})
 
-        updated = content
-        # .allowedOrigins(...) pattern
-        pattern = r'(\.allowedOrigins\()([^)]+)(\))'
-        match = re.search(pattern, updated)
-        if match:
-            origins = match.group(2).rstrip()
-            updated = updated[:match.start(2)] + f'{origins}, "{frontend_url}"' + updated[match.end(2):]
-
-        # @CrossOrigin(origins = {...}) pattern
-        pattern = r'(@CrossOrigin\(origins\s*=\s*\{)([^}]+)(\})'
-        match = re.search(pattern, updated)
-        if match:
-            origins = match.group(2).rstrip()
-            updated = updated[:match.start(2)] + f'{origins}, "{frontend_url}"' + updated[match.end(2):]
-
-        # @CrossOrigin(origins = "single") pattern
-        pattern = r'(@CrossOrigin\(origins\s*=\s*)"([^"]+)"'
-        match = re.search(pattern, updated)
-        if match and "{" not in match.group(0):
-            orig = match.group(2)
-            replacement = f'{match.group(1)}{{"{orig}", "{frontend_url}"}}'
-            updated = updated[:match.start()] + replacement + updated[match.end():]
-
-        if updated != content:
-            java_file.write_text(updated)
-            files_updated += 1
+    url = frontend_url.encode()
+    addition = b', "' + url + b'"'
+    results = await _map_files_in_threads(
+        _rewrite_cors_in_file, _iter_java_files(src_java), url, addition, default=False,
+    )
+    files_updated = sum(results)
 
-    return json.dumps({"success": True, "files_updated": files_updated})
+    return _to_json({"success": True, "files_updated": files_updated})
 
 
 # ============================================================================
@@ -692,7 +1362,7 @@ async def configure_frontend_env(frontend_path: str, backend_url: str) -> str:
         f"VITE_API_URL={backend_url}\n"
         f"VITE_BACKEND_URL={backend_url}\n"
     )
-    return json.dumps({"success": True, "env_file": str(env_file)})
+    return _to_json({"success": True, "env_file": str(env_file)})
 
 
 async def install_npm_dependencies(frontend_path: str) -> str:
@@ -705,11 +1375,11 @@ async def install_npm_dependencies(frontend_path: str) -> str:
         JSON string with success status.
     """
     fp = Path(frontend_path)
-    cmd = "npm ci" if (fp / "package-lock.json").exists() else "npm install"
+    cmd = ["npm", "ci"] if (fp / "package-lock.json").exists() else ["npm", "install"]
     r = await _run_command(cmd, cwd=str(fp))
     if r["returncode"] == 0:
-        return json.dumps({"success": True})
-    return json.dumps({"success": False, "error": r["stderr"][:500]})
+        return _to_json({"success": True})
+    return _to_json({"success": False, "error": r["stderr"][:500]})
 
 
 async def build_frontend(frontend_path: str) -> str:
@@ -722,15 +1392,15 @@ async def build_frontend(frontend_path: str) -> str:
         JSON string with success status and build_dir.
     """
     fp = Path(frontend_path)
-    r = await _run_command("npm run build", cwd=str(fp))
+    r = await _run_command(["npm", "run", "build"], cwd=str(fp))
     if r["returncode"] != 0:
-        return json.dumps({"success": False, "error": r["stderr"][:500]})
+        return _to_json({"success": False, "error": r["stderr"][:500]})
 
     build_dir = fp / "dist" if (fp / "dist").exists() else fp / "build"
     if not build_dir.exists():
-        return json.dumps({"success": False, "error": "Build directory not found (expected dist/ or build/)"})
+        return _to_json({"success": False, "error": "Build directory not found (expected dist/ or build/)"})
 
-    return json.dumps({"success": True, "build_dir": str(build_dir)})
+    return _to_json({"success": True, "build_dir": str(build_dir)})
 
 
 async def deploy_to_firebase(frontend_path: str, project_id: str, site_name: str) -> str:
@@ -764,13 +1434,19 @@ async def deploy_to_firebase(frontend_path: str, project_id: str, site_name: str
     (fp / ".firebaserc").write_text(json.dumps({"projects": {"default": project_id}}, indent=2))
 
     # Ensure hosting site exists (short timeout — may already exist, which is fine)
-    await _run_command(f"firebase hosting:sites:create {site_name} --project={project_id} --non-interactive", cwd=str(fp), timeout=60)
+    await _run_command(
+        ["firebase", "hosting:sites:create", site_name, f"--project={project_id}", "--non-interactive"],
+        cwd=str(fp), timeout=60,
+    )
 
     # Deploy
-    r = await _run_command(f"firebase deploy --only hosting:{site_name} --project={project_id} --non-interactive --force", cwd=str(fp))
+    r = await _run_command(
+        ["firebase", "deploy", "--only", f"hosting:{site_name}", f"--project={project_id}", "--non-interactive", "--force"],
+        cwd=str(fp),
+    )
     if r["returncode"] != 0:
         error = r["stderr"] or r["stdout"]
-        return json.dumps({"success": False, "error": error[:500]})
+        return _to_json({"success": False, "error": error[:500]})
 
     hosting_url = f"https://{site_name}.web.app"
     # Try to extract actual URL from output
@@ -779,7 +1455,7 @@ async def deploy_to_firebase(frontend_path: str, project_id: str, site_name: str
             hosting_url = line.split("Hosting URL:")[-1].strip()
             break
 
-    return json.dumps({"success": True, "hosting_url": hosting_url})
+    return _to_json({"success": True, "hosting_url": hosting_url})
 
 
 # ============================================================================
@@ -810,8 +1486,12 @@ DATABASE_TOOLS = [
 
 BACKEND_DEPLOYMENT_TOOLS = [
     write_dockerfile,
+    fingerprint_backend_source,
+    get_image_fingerprint,
     build_docker_image,
     push_docker_image,
+    check_docker_buildx,
+    build_and_push_docker_image,
     deploy_to_cloud_run,
     update_cors_origins,
 ]
@@ -830,3 +1510,11 @@ ALL_TOOLS = list(set(
     + BACKEND_DEPLOYMENT_TOOLS
     + FRONTEND_DEPLOYMENT_TOOLS
 ))
+
+# Name -> tool lookup so each LLM call ships only the schemas it needs
+TOOL_REGISTRY: dict[str, Callable] = {tool.__name__: tool for tool in ALL_TOOLS}
+
+
+def get_tools(*names: str) -> list[Callable]:
+    """Resolve tool names from TOOL_REGISTRY, sorted by name for stable schemas."""
+    return [TOOL_REGISTRY[name] for name in sorted(set(names))]
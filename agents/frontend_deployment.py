@@ -12,7 +12,7 @@ import json
 from pathlib import Path
 from typing import Any, Dict
 
-from .base_agent import AgentResult, AgentStatus, BaseAgent, Event, EventType, ModelRole
+from .base_agent import AgentResult, AgentStatus, BaseAgent, Event, EventType
 from .dedalus_tools import (
     FRONTEND_DEPLOYMENT_TOOLS,
     build_frontend,
@@ -31,6 +31,9 @@ class FrontendDeploymentAgent(BaseAgent):
     is straightforward compared to code analysis or Dockerfile generation.
     """
 
+    DEPENDS_ON = frozenset({EventType.BACKEND_DEPLOYED})
+    PUBLISHES = frozenset({EventType.FRONTEND_DEPLOYED})
+
     def __init__(self, event_bus, config: Dict[str, Any], dedalus_api_key: str):
         super().__init__(
             name="FrontendDeployment",
@@ -49,9 +52,9 @@ class FrontendDeploymentAgent(BaseAgent):
         backend_data = None
 
         for i in range(max_retries):
-            backend_events = self.event_bus.get_history(EventType.BACKEND_DEPLOYED)
-            if backend_events:
-                backend_data = backend_events[-1].data
+            backend_event = self.event_bus.get_last(EventType.BACKEND_DEPLOYED)
+            if backend_event is not None:
+                backend_data = backend_event.data
                 self.logger.info("Backend deployment detected!")
                 break
             if i % 6 == 0:
@@ -137,7 +140,8 @@ class FrontendDeploymentAgent(BaseAgent):
                 errors.append(f"Firebase deployment failed: {deploy_data.get('error')}")
                 return AgentResult(status=AgentStatus.FAILED, data=deployment_result, errors=errors)
 
-            # Step 5: Use FAST model for quick deployment verification
+            # Step 5: Quick deployment verification (single-step and tool-free,
+            # so _pick_model routes it to the FAST model)
             try:
                 verification = await self.run_with_dedalus(
                     prompt=(
@@ -145,7 +149,6 @@ class FrontendDeploymentAgent(BaseAgent):
                         f"with backend at {backend_url}. "
                         f"Provide 1-2 quick post-deployment checks to verify everything works."
                     ),
-                    model=ModelRole.FAST.value,
                     instructions="You are a deployment verification expert. Be very concise.",
                     max_steps=1,
                 )
@@ -12,11 +12,11 @@ from typing import Any, Dict
 
 from .base_agent import AgentResult, AgentStatus, BaseAgent, Event, EventType, ModelRole
 from .dedalus_tools import (
-    INFRASTRUCTURE_TOOLS,
     check_gcloud_auth,
     configure_iam_permissions,
     create_artifact_registry,
     enable_gcp_apis,
+    get_tools,
     setup_firebase_project,
 )
 
@@ -29,6 +29,9 @@ class InfrastructureAgent(BaseAgent):
     for all GCP provisioning operations.
     """
 
+    DEPENDS_ON = frozenset({EventType.ANALYSIS_COMPLETE})
+    PUBLISHES = frozenset({EventType.INFRASTRUCTURE_READY})
+
     def __init__(self, event_bus, config: Dict[str, Any], dedalus_api_key: str):
         super().__init__(
             name="Infrastructure",
@@ -136,11 +139,11 @@ class InfrastructureAgent(BaseAgent):
                 review = await self.run_with_dedalus(
                     prompt=(
                         f"Review this GCP infrastructure setup and suggest any improvements:\n"
-                        f"{json.dumps(provisioned, indent=2)}\n\n"
+                        f"{json.dumps(provisioned, separators=(',', ':'))}\n\n"
                         f"Provide 1-2 brief recommendations."
                     ),
                     model=ModelRole.PLANNING.value,
-                    tools=INFRASTRUCTURE_TOOLS,
+                    tools=get_tools("check_gcloud_auth"),
                     instructions="You are a GCP infrastructure expert. Be concise.",
                     max_steps=3,
                 )
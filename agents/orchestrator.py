@@ -20,7 +20,6 @@ from .base_agent import (
     Event,
     EventBus,
     EventType,
-    ModelRole,
 )
 
 
@@ -163,12 +162,38 @@ class OrchestratorAgent(BaseAgent):
 
         return tools
 
+    @staticmethod
+    def _build_dependency_graph(
+        agents: List[BaseAgent],
+    ) -> Dict[str, List[str]]:
+        """Map each agent name to the agents whose events it consumes.
+
+        An agent depends on every other agent that PUBLISHES an event type
+        listed in its DEPENDS_ON set.
+        """
+        producers: Dict[EventType, List[str]] = {}
+        for agent in agents:
+            for event_type in agent.PUBLISHES:
+                producers.setdefault(event_type, []).append(agent.name)
+
+        graph: Dict[str, List[str]] = {}
+        for agent in agents:
+            upstream = set()
+            for event_type in agent.DEPENDS_ON:
+                upstream.update(producers.get(event_type, []))
+            upstream.discard(agent.name)
+            graph[agent.name] = sorted(upstream)
+        return graph
+
     async def _execute_agents_with_dependencies(
         self, agents: List[BaseAgent],
     ) -> Dict[str, AgentResult]:
-        """Execute agents with dependency management and model handoffs.
+        """Execute agents in dependency order, running independent ones concurrently.
 
-        Each phase uses a different model optimized for that task type:
+        The execution DAG is derived from each agent's DEPENDS_ON/PUBLISHES
+        declarations and walked with Kahn's algorithm: an agent starts as soon
+        as all of its upstream agents have succeeded. Agents whose upstream
+        failed are skipped. Each agent still uses its own model:
         - Code Analysis: Reasoning model (GPT-4.1) for deep analysis
         - Infrastructure: Planning model (Claude Sonnet) for GCP setup
         - Database: Multi-model routing for analysis + recommendations
@@ -176,66 +201,67 @@ class OrchestratorAgent(BaseAgent):
         - Frontend Deploy: Fast model (GPT-4.1-mini) for simple build/deploy
         """
         results: Dict[str, AgentResult] = {}
-
-        # Phase 1: Code Analysis — uses REASONING model
-        self.logger.info("Phase 1: Code Analysis [Model: REASONING]")
-        analyzer = next(a for a in agents if a.name == "CodeAnalyzer")
-        results[analyzer.name] = await analyzer.execute()
-
-        if results[analyzer.name].status != AgentStatus.SUCCESS:
-            self.logger.error("Code analysis failed, aborting migration")
-            return results
-
-        # Phase 2: Infrastructure Provisioning — uses PLANNING model
-        self.logger.info("Phase 2: Infrastructure [Model: PLANNING]")
-        infra = next(a for a in agents if a.name == "Infrastructure")
-        results[infra.name] = await infra.execute()
-
-        if results[infra.name].status != AgentStatus.SUCCESS:
-            self.logger.error("Infrastructure provisioning failed, aborting migration")
-            return results
-
-        # Phase 3: Database Migration — uses MULTI_MODEL routing
-        self.logger.info("Phase 3: Database Migration [Model: MULTI_MODEL]")
-        db_migration = next(a for a in agents if a.name == "DatabaseMigration")
-        results[db_migration.name] = await db_migration.execute()
-
-        if results[db_migration.name].status != AgentStatus.SUCCESS:
-            self.logger.warning("Database migration failed, but continuing...")
-
-        # Phase 4: Backend + Frontend Deployment (parallel)
-        backend = next(a for a in agents if a.name == "BackendDeployment")
-        frontend = next(a for a in agents if a.name == "FrontendDeployment")
-
-        if self.config.get("migration", {}).get("agents", {}).get("parallel_execution", True):
-            self.logger.info("Phase 4: Parallel Deployment [Backend: CODE_GEN, Frontend: FAST]")
-            backend_task = asyncio.create_task(backend.execute())
-            frontend_task = asyncio.create_task(frontend.execute())
-
-            backend_result, frontend_result = await asyncio.gather(
-                backend_task, frontend_task, return_exceptions=True,
-            )
-
-            results[backend.name] = (
-                backend_result if not isinstance(backend_result, Exception)
-                else AgentResult(status=AgentStatus.FAILED, data={}, errors=[str(backend_result)])
-            )
-            results[frontend.name] = (
-                frontend_result if not isinstance(frontend_result, Exception)
-                else AgentResult(status=AgentStatus.FAILED, data={}, errors=[str(frontend_result)])
-            )
-        else:
-            self.logger.info("Phase 4: Sequential Deployment")
-            results[backend.name] = await backend.execute()
-            results[frontend.name] = await frontend.execute()
+        by_name = {agent.name: agent for agent in agents}
+        graph = self._build_dependency_graph(agents)
+
+        remaining = {name: len(upstream) for name, upstream in graph.items()}
+        downstream: Dict[str, List[str]] = {name: [] for name in graph}
+        for name, upstream in graph.items():
+            for dep in upstream:
+                downstream[dep].append(name)
+
+        parallel = self.config.get("migration", {}).get("agents", {}).get("parallel_execution", True)
+        ready = [agent.name for agent in agents if remaining[agent.name] == 0]
+        running: Dict[asyncio.Task, str] = {}
+        blocked: set = set()
+
+        while ready or running:
+            # Sequential mode launches one ready agent at a time
+            launch = ready if parallel else ready[:1]
+            ready = ready[len(launch):]
+            for name in launch:
+                self.logger.info(f"Starting {name} (depends on: {', '.join(graph[name]) or 'none'})")
+                running[asyncio.create_task(by_name[name].execute())] = name
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                try:
+                    results[name] = task.result()
+                except Exception as e:
+                    results[name] = AgentResult(status=AgentStatus.FAILED, data={}, errors=[str(e)])
+
+                if results[name].status != AgentStatus.SUCCESS:
+                    if downstream[name]:
+                        self.logger.error(
+                            f"{name} failed, skipping dependents: {', '.join(downstream[name])}"
+                        )
+                        stack = list(downstream[name])
+                        while stack:
+                            child = stack.pop()
+                            if child not in blocked:
+                                blocked.add(child)
+                                stack.extend(downstream[child])
+                    else:
+                        self.logger.warning(f"{name} failed, but continuing...")
+
+                for child in downstream[name]:
+                    remaining[child] -= 1
+                    if remaining[child] == 0 and child not in blocked:
+                        ready.append(child)
+
+        unscheduled = [name for name in graph if name not in results and name not in blocked]
+        if unscheduled:
+            raise RuntimeError(f"Dependency cycle between agents: {', '.join(unscheduled)}")
 
         return results
 
     async def _generate_ai_summary(self, results: Dict[str, AgentResult]) -> Dict[str, Any]:
         """Use Dedalus multi-model handoff to generate an intelligent migration summary.
 
-        Uses FAST model for quick summary generation with Brave Search MCP
-        for any follow-up recommendations.
+        The single-step, tool-free summary call carries no explicit model, so
+        _pick_model routes it to the FAST model unless the phase results make
+        the prompt long.
         """
         summary = {
             "migration_status": "success" if all(
@@ -271,7 +297,7 @@ class OrchestratorAgent(BaseAgent):
 
         # Use Dedalus to generate AI-powered insights about the migration
         try:
-            phase_summary = json.dumps(summary["phases"], indent=2)
+            phase_summary = json.dumps(summary["phases"], separators=(",", ":"))
             ai_insight = await self.run_with_dedalus(
                 prompt=(
                     f"You just completed a cloud migration. Here are the phase results:\n"
@@ -279,7 +305,6 @@ class OrchestratorAgent(BaseAgent):
                     f"Provide a 2-3 sentence executive summary of the migration outcome, "
                     f"highlighting which models handled which phases and any notable tool usage."
                 ),
-                model=ModelRole.FAST.value,
                 instructions="You are a cloud migration summary generator. Be concise and factual.",
                 max_steps=1,
             )
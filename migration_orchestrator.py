@@ -29,7 +29,7 @@ from rich.tree import Tree
 
 from agents.base_agent import Event, EventBus, EventType
 from agents.orchestrator import OrchestratorAgent
-from utils import FileOperations, setup_logging
+from utils import FileOperations, install_event_loop, setup_logging
 
 # Load environment variables
 load_dotenv()
@@ -230,6 +230,7 @@ async def run_migration(config_path: Path, dry_run: bool = False):
 
     with Live(migration_progress.progress, console=console, refresh_per_second=4):
         result = await orchestrator.execute()
+        await event_bus.drain()
 
     console.print("\n")
 
@@ -426,6 +427,7 @@ def migrate(
             console.print("Migration cancelled.")
             raise typer.Exit(code=0)
 
+    install_event_loop()
     asyncio.run(run_migration(config_file, dry_run))
 
 
@@ -0,0 +1,63 @@
+"""
+Unit tests for the BackendDeployment agent.
+"""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from agents.backend_deployment import BackendDeploymentAgent
+from agents.base_agent import BackendAnalysis, EventBus
+
+
+class _StreamingRunner:
+    """Runner stub streaming a fenced Dockerfile in small fragments."""
+
+    def __init__(self):
+        self.kwargs = None
+
+    def run(self, **kwargs):
+        self.kwargs = kwargs
+        return self._chunks()
+
+    async def _chunks(self):
+        for text in ["```dockerfile\nFROM eclipse-", "temurin:21\nEXPOSE 8080", "\n```"]:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    """Create BackendDeployment agent fixture with a private Dockerfile cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    agent = BackendDeploymentAgent(event_bus=EventBus(), config={}, dedalus_api_key="test-key")
+    agent.runner = _StreamingRunner()
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_generate_dockerfile_streams_lines_to_log(agent, caplog):
+    """Test the Dockerfile is streamed and each line is logged as it completes."""
+    with caplog.at_level(logging.INFO, logger=agent.logger.name):
+        content, _ = await agent._generate_dockerfile(BackendAnalysis())
+
+    assert content == "FROM eclipse-temurin:21\nEXPOSE 8080"
+    assert agent.runner.kwargs["stream"] is True
+    assert "Dockerfile | FROM eclipse-temurin:21" in caplog.messages
+    assert "Dockerfile | EXPOSE 8080" in caplog.messages
+
+
+@pytest.mark.asyncio
+async def test_dockerfile_cached_only_after_build(agent):
+    """Test a generated Dockerfile is not reused until its image has built."""
+    content, cache_file = await agent._generate_dockerfile(BackendAnalysis())
+    assert not cache_file.exists()
+
+    agent._write_private_cache(cache_file, content)
+    agent.runner = None  # a cache hit must not reach the model
+    assert await agent._generate_dockerfile(BackendAnalysis()) == (content, cache_file)
+
+    agent._discard_cached_dockerfile(cache_file)
+    agent.runner = _StreamingRunner()
+    await agent._generate_dockerfile(BackendAnalysis())
+    assert agent.runner.kwargs is not None
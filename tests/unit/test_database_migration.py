@@ -0,0 +1,34 @@
+"""
+Unit tests for the DatabaseMigration agent.
+"""
+
+import pytest
+
+from agents.base_agent import EventBus
+from agents.database_migration import DatabaseMigrationAgent
+
+
+class _FailingRunner:
+    """Runner stub that fails the test if the model is called."""
+
+    async def run(self, **kwargs):
+        raise AssertionError("model should not be called")
+
+
+@pytest.fixture
+def agent():
+    """Create DatabaseMigration agent fixture."""
+    agent = DatabaseMigrationAgent(event_bus=EventBus(), config={}, dedalus_api_key="test-key")
+    agent.runner = _FailingRunner()
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_known_combination_skips_model(agent):
+    """Test curated recommendations are returned for a known type/mode/strategy."""
+    recommendations = await agent._get_ai_recommendations(
+        {"type": "h2", "mode": "in-memory"}, "migrate-to-cloud-sql",
+    )
+
+    assert len(recommendations) == 3
+    assert any("HikariCP" in rec for rec in recommendations)
@@ -0,0 +1,578 @@
+"""
+Unit tests for Dedalus tool functions.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+from agents import dedalus_tools
+from agents.dedalus_tools import (
+    _compute_source_fingerprint,
+    analyze_spring_properties,
+    analyze_react_app,
+    detect_database_type,
+    enable_gcp_apis,
+    extract_api_endpoints,
+    scan_gradle_build,
+    scan_maven_pom,
+    update_cors_origins,
+)
+
+
+FRONTEND_URL = "https://test-site.web.app"
+
+
+@pytest.fixture
+def backend_path(tmp_path):
+    """Create an empty Spring Boot backend directory."""
+    backend = tmp_path / "backend"
+    (backend / "src" / "main" / "java" / "com" / "example").mkdir(parents=True)
+    return backend
+
+
+@pytest.fixture
+def java_src(backend_path):
+    """Java package directory inside the backend fixture."""
+    return backend_path / "src" / "main" / "java" / "com" / "example"
+
+
+@pytest.mark.asyncio
+async def test_update_cors_allowed_origins(backend_path, java_src):
+    """Test .allowedOrigins(...) gets the frontend URL appended."""
+    config = java_src / "WebConfig.java"
+    config.write_text(
+        'registry.addMapping("/**").allowedOrigins("http://localhost:5173");\n'
+    )
+
+    result = json.loads(await update_cors_origins(str(backend_path), FRONTEND_URL))
+
+    assert result["success"] is True
+    assert result["files_updated"] == 1
+    assert f'.allowedOrigins("http://localhost:5173", "{FRONTEND_URL}")' in config.read_text()
+
+
+@pytest.mark.asyncio
+async def test_update_cors_cross_origin_single(backend_path, java_src):
+    """Test @CrossOrigin(origins = "...") is widened to an array."""
+    controller = java_src / "ApiController.java"
+    controller.write_text('@CrossOrigin(origins = "http://localhost:3000")\npublic class ApiController {}\n')
+    untouched = java_src / "Model.java"
+    untouched.write_text("public class Model {}\n")
+
+    result = json.loads(await update_cors_origins(str(backend_path), FRONTEND_URL))
+
+    assert result["files_updated"] == 1
+    assert f'@CrossOrigin(origins = {{"http://localhost:3000", "{FRONTEND_URL}"}})' in controller.read_text()
+    assert untouched.read_text() == "public class Model {}\n"
+
+
+@pytest.mark.asyncio
+async def test_update_cors_no_java_dir(tmp_path):
+    """Test missing Java source directory reports failure."""
+    result = json.loads(await update_cors_origins(str(tmp_path), FRONTEND_URL))
+
+    assert result["success"] is False
+
+
+def test_source_fingerprint_tracks_changes(backend_path, java_src):
+    """Test the backend fingerprint ignores Dockerfile mtime but not sources."""
+    (backend_path / "Dockerfile").write_text("FROM eclipse-temurin:21\n")
+    app = java_src / "App.java"
+    app.write_text("public class App {}\n")
+
+    first = _compute_source_fingerprint(str(backend_path))
+    (backend_path / "Dockerfile").write_text("FROM eclipse-temurin:21\n")
+    assert _compute_source_fingerprint(str(backend_path)) == first
+
+    app.write_text("public class App { int x; }\n")
+    assert _compute_source_fingerprint(str(backend_path)) != first
+
+
+@pytest.mark.asyncio
+async def test_update_cors_multiple_sites(backend_path, java_src):
+    """Test every CORS site in a file is updated, not only the first."""
+    controller = java_src / "MultiController.java"
+    controller.write_text(
+        '@CrossOrigin(origins = {"http://a.test"})\n'
+        "class A {}\n"
+        '@CrossOrigin(origins = "http://b.test")\n'
+        "class B {}\n"
+    )
+
+    result = json.loads(await update_cors_origins(str(backend_path), FRONTEND_URL))
+
+    content = controller.read_text()
+    assert result["files_updated"] == 1
+    assert f'@CrossOrigin(origins = {{"http://a.test", "{FRONTEND_URL}"}})' in content
+    assert f'@CrossOrigin(origins = {{"http://b.test", "{FRONTEND_URL}"}})' in content
+
+
+@pytest.mark.asyncio
+async def test_extract_api_endpoints(backend_path, java_src):
+    """Test controller mappings are prefixed with the class-level base path."""
+    (java_src / "TodoController.java").write_text(
+        '@RestController\n@RequestMapping("/api/todos")\nclass TodoController {\n'
+        '  @GetMapping("/all") void all() {}\n'
+        '  @DeleteMapping("/{id}") void delete() {}\n}\n'
+    )
+    (java_src / "Todo.java").write_text("class Todo {}\n")
+
+    controllers = json.loads(await extract_api_endpoints(str(backend_path)))
+
+    assert len(controllers) == 1
+    assert controllers[0]["endpoints"] == [
+        {"method": "GET", "path": "/api/todos/all"},
+        {"method": "DELETE", "path": "/api/todos/{id}"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_scan_gradle_build(backend_path):
+    """Test Gradle Java version and implementation dependencies are extracted."""
+    (backend_path / "build.gradle").write_text(
+        "sourceCompatibility = '17'\n"
+        "dependencies {\n"
+        "  implementation 'org.springframework.boot:spring-boot-starter-web'\n"
+        "}\n"
+    )
+
+    result = json.loads(await scan_gradle_build(str(backend_path)))
+
+    assert result["java_version"] == "17"
+    assert result["dependencies"] == ["org.springframework.boot:spring-boot-starter-web"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_react_app_collects_urls(tmp_path):
+    """Test hardcoded API URLs are collected across JS/TS sources."""
+    frontend = tmp_path / "frontend"
+    (frontend / "src" / "api").mkdir(parents=True)
+    (frontend / "package.json").write_text(json.dumps({
+        "dependencies": {"react": "^18.2.0"},
+        "scripts": {"dev": "vite"},
+    }))
+    (frontend / "src" / "App.jsx").write_text('fetch("http://localhost:8080/api/todos")\n')
+    (frontend / "src" / "api" / "client.ts").write_text("const BASE = 'https://api.example.com';\n")
+    vendored = frontend / "src" / "node_modules" / "lib"
+    vendored.mkdir(parents=True)
+    (vendored / "index.js").write_text('fetch("https://vendor.example.com")\n')
+    (frontend / "src" / "bundle.min.js").write_text('fetch("https://bundle.example.com");' + " " * 2_000_000)
+
+    result = json.loads(await analyze_react_app(str(frontend)))
+
+    assert result["build_tool"] == "vite"
+    assert result["react_version"] == "^18.2.0"
+    assert sorted(result["api_endpoints"]) == ["http://localhost:8080/api/todos", "https://api.example.com"]
+
+
+@pytest.mark.asyncio
+async def test_scan_maven_pom(backend_path):
+    """Test Java version, parent version and project dependencies are extracted."""
+    (backend_path / "pom.xml").write_text(
+        '<project xmlns="http://maven.apache.org/POM/4.0.0">'
+        "<parent><groupId>org.springframework.boot</groupId><version>3.2.1</version></parent>"
+        "<properties><java.version>21</java.version></properties>"
+        "<dependencies>"
+        "<dependency><artifactId>spring-boot-starter-web</artifactId></dependency>"
+        "<dependency><artifactId>h2</artifactId></dependency>"
+        "</dependencies>"
+        "<build><plugins><plugin><dependencies>"
+        "<dependency><artifactId>plugin-only</artifactId></dependency>"
+        "</dependencies></plugin></plugins></build>"
+        "</project>"
+    )
+
+    result = json.loads(await scan_maven_pom(str(backend_path)))
+
+    assert result["java_version"] == "21"
+    assert result["spring_boot_version"] == "3.2.1"
+    assert result["dependencies"] == ["spring-boot-starter-web", "h2"]
+
+
+@pytest.mark.asyncio
+async def test_scan_maven_pom_build_before_dependencies(backend_path):
+    """Test dependencies declared after <build> are still reported."""
+    (backend_path / "pom.xml").write_text(
+        '<project xmlns="http://maven.apache.org/POM/4.0.0">'
+        "<properties><java.version>17</java.version></properties>"
+        "<build><plugins><plugin><dependencies>"
+        "<dependency><artifactId>plugin-only</artifactId></dependency>"
+        "</dependencies></plugin></plugins></build>"
+        "<dependencies>"
+        "<dependency><artifactId>spring-boot-starter-web</artifactId></dependency>"
+        "</dependencies>"
+        "</project>"
+    )
+
+    result = json.loads(await scan_maven_pom(str(backend_path)))
+
+    assert result["java_version"] == "17"
+    assert result["dependencies"] == ["spring-boot-starter-web"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_spring_properties_yaml(backend_path):
+    """Test application.yaml datasource and server settings are flattened."""
+    resources = backend_path / "src" / "main" / "resources"
+    resources.mkdir(parents=True)
+    (resources / "application.yaml").write_text(
+        "spring:\n"
+        "  datasource:\n"
+        "    url: jdbc:h2:mem:testdb\n"
+        "server:\n"
+        "  port: 8080\n"
+    )
+
+    result = json.loads(await analyze_spring_properties(str(backend_path)))
+
+    assert result["database_config"] == {"spring.datasource.url": "jdbc:h2:mem:testdb"}
+    assert result["server_config"] == {"server.port": "8080"}
+
+
+@pytest.mark.asyncio
+async def test_analyze_spring_properties_file(backend_path):
+    """Test application.properties keys are routed to database and server config."""
+    resources = backend_path / "src" / "main" / "resources"
+    resources.mkdir(parents=True)
+    (resources / "application.properties").write_text(
+        "# datasource\n"
+        "spring.datasource.url = jdbc:h2:mem:testdb\n"
+        "\n"
+        "spring.jpa.show-sql=true\n"
+        "server.port=8080\n"
+        "logging.level.root=INFO\n"
+        "spring.h2.console.enabled=true\r\n"
+    )
+
+    result = json.loads(await analyze_spring_properties(str(backend_path)))
+
+    assert result["database_config"] == {
+        "spring.datasource.url": "jdbc:h2:mem:testdb",
+        "spring.jpa.show-sql": "true",
+        "spring.h2.console.enabled": "true",
+    }
+    assert result["server_config"] == {"server.port": "8080"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url, db_type, mode", [
+    ("jdbc:h2:mem:testdb", "h2", "in-memory"),
+    ("jdbc:h2:file:./data/db", "h2", "file-based"),
+    ("jdbc:mysql://db:3306/app", "mysql", "external"),
+    ("jdbc:postgresql://db:5432/app", "postgresql", "external"),
+    ("jdbc:oracle:thin:@db:1521", "unknown", "unknown"),
+])
+async def test_detect_database_type(url, db_type, mode):
+    """Test JDBC URLs are classified by database type and mode."""
+    result = json.loads(await detect_database_type(url))
+
+    assert result["type"] == db_type
+    assert result["mode"] == mode
+    assert result["migration_recommended"] is (db_type != "unknown")
+
+
+@pytest.mark.asyncio
+async def test_extract_api_endpoints_sees_edited_files(backend_path, java_src):
+    """Test per-file scan results are reused only while the file is unchanged."""
+    controller = java_src / "PingController.java"
+    controller.write_text('@RestController\nclass PingController {\n  @GetMapping("/ping") void ping() {}\n}\n')
+
+    first = await extract_api_endpoints(str(backend_path))
+    assert await extract_api_endpoints(str(backend_path)) == first
+
+    controller.write_text(
+        '@RestController\nclass PingController {\n  @GetMapping("/ping") void ping() {}\n'
+        '  @PostMapping("/pong") void pong() {}\n}\n'
+    )
+    controllers = json.loads(await extract_api_endpoints(str(backend_path)))
+
+    assert controllers[0]["endpoints"][-1] == {"method": "POST", "path": "/pong"}
+
+
+@pytest.mark.asyncio
+async def test_extract_api_endpoints_scans_every_package(backend_path, java_src):
+    """Test controllers outside web-layer packages are found alongside them."""
+    (java_src / "web").mkdir()
+    (java_src / "web" / "WebConfig.java").write_text("@Configuration\nclass WebConfig {}\n")
+    (java_src / "controller").mkdir()
+    (java_src / "controller" / "UserController.java").write_text(
+        '@RestController\nclass UserController {\n  @GetMapping("/users") void list() {}\n}\n'
+    )
+    (java_src / "legacy").mkdir()
+    (java_src / "legacy" / "LegacyController.java").write_text(
+        '@RestController\nclass LegacyController {\n  @GetMapping("/legacy") void legacy() {}\n}\n'
+    )
+
+    controllers = json.loads(await extract_api_endpoints(str(backend_path)))
+
+    assert sorted(e["path"] for c in controllers for e in c["endpoints"]) == ["/legacy", "/users"]
+
+
+@pytest.mark.asyncio
+async def test_analyze_react_app_tolerates_bad_files(tmp_path):
+    """Test a non-UTF-8 source file is still scanned for URLs."""
+    src = tmp_path / "frontend" / "src"
+    src.mkdir(parents=True)
+    (src / "legacy.js").write_bytes(b'// \xff\xfe\nfetch("https://api.example.com")\n')
+
+    result = json.loads(await analyze_react_app(str(tmp_path / "frontend")))
+
+    assert result["api_endpoints"] == ["https://api.example.com"]
+
+
+@pytest.mark.asyncio
+async def test_extract_api_endpoints_bare_and_named_mappings(backend_path, java_src):
+    """Test bare and value=/path= mappings resolve against the base path."""
+    (java_src / "NoteController.java").write_text(
+        '@RestController\n@RequestMapping("/api/notes")\nclass NoteController {\n'
+        "  @GetMapping void list() {}\n"
+        '  @PostMapping(value = "/bulk") void bulk() {}\n'
+        '  @PutMapping(path = "/{id}", consumes = "application/json") void put() {}\n}\n'
+    )
+    (java_src / "RootController.java").write_text("@Controller\nclass RootController {\n  @GetMapping() void home() {}\n}\n")
+
+    controllers = json.loads(await extract_api_endpoints(str(backend_path)))
+    by_file = {c["file"].rsplit("/", 1)[-1]: c["endpoints"] for c in controllers}
+
+    assert by_file["NoteController.java"] == [
+        {"method": "GET", "path": "/api/notes"},
+        {"method": "POST", "path": "/api/notes/bulk"},
+        {"method": "PUT", "path": "/api/notes/{id}"},
+    ]
+    assert by_file["RootController.java"] == [{"method": "GET", "path": "/"}]
+
+
+@pytest.mark.asyncio
+async def test_analyze_react_app_without_src_dir(tmp_path):
+    """Test the project root is scanned when there is no src/ directory."""
+    frontend = tmp_path / "frontend"
+    (frontend / "app").mkdir(parents=True)
+    (frontend / "app" / "page.tsx").write_text('fetch("https://api.example.com/items")\n')
+    (frontend / "node_modules" / "lib").mkdir(parents=True)
+    (frontend / "node_modules" / "lib" / "index.js").write_text('fetch("https://vendor.example.com")\n')
+
+    result = json.loads(await analyze_react_app(str(frontend)))
+
+    assert result["api_endpoints"] == ["https://api.example.com/items"]
+
+
+@pytest.mark.asyncio
+async def test_enable_gcp_apis_batches_into_one_call(monkeypatch):
+    """Test all APIs are enabled by one gcloud call when it succeeds."""
+    calls = []
+
+    async def fake_gcloud(args):
+        calls.append(args)
+        return {"returncode": 0, "stdout": "", "stderr": ""}
+
+    monkeypatch.setattr(dedalus_tools, "_run_gcloud", fake_gcloud)
+
+    result = json.loads(await enable_gcp_apis("proj", ["run.googleapis.com", "sqladmin.googleapis.com"]))
+
+    assert result == {"run.googleapis.com": "enabled", "sqladmin.googleapis.com": "enabled"}
+    assert calls == [["services", "enable", "run.googleapis.com", "sqladmin.googleapis.com", "--project=proj"]]
+
+
+@pytest.mark.asyncio
+async def test_project_number_lookup_is_cached(monkeypatch):
+    """Test the project number is fetched once, and failures are retried."""
+    calls = []
+    responses = iter([
+        {"returncode": 1, "stdout": "", "stderr": "denied"},
+        {"returncode": 0, "stdout": "123456\n", "stderr": ""},
+    ])
+
+    async def fake_gcloud(args):
+        calls.append(args)
+        return next(responses)
+
+    monkeypatch.setattr(dedalus_tools, "_run_gcloud", fake_gcloud)
+    dedalus_tools._get_project_number.cache_clear()
+
+    assert await dedalus_tools._get_project_number("proj") is None
+    results = await asyncio.gather(*(dedalus_tools._get_project_number("proj") for _ in range(3)))
+
+    assert results == ["123456"] * 3
+    assert len(calls) == 2
+    dedalus_tools._get_project_number.cache_clear()
+
+
+def test_source_read_cache_is_bounded_by_bytes(tmp_path, monkeypatch):
+    """Test cached source bytes are evicted oldest-first past the byte budget."""
+    monkeypatch.setattr(dedalus_tools, "_SOURCE_CACHE_BYTES", 250)
+    dedalus_tools._clear_source_cache()
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"File{i}.java"
+        path.write_bytes(b"x" * 100)
+        paths.append(str(path))
+
+    for path in paths:
+        assert dedalus_tools._read_source_bytes(path) == b"x" * 100
+
+    assert list(dedalus_tools._source_cache) == paths[2:]
+    assert dedalus_tools._source_cache_size == 200
+    dedalus_tools._clear_source_cache()
+
+
+@pytest.mark.asyncio
+async def test_docker_auth_retried_after_failure(monkeypatch):
+    """Test a failed configure-docker is not remembered as configured."""
+    calls = []
+    returncodes = iter([1, 0])
+
+    async def fake_gcloud(args):
+        calls.append(args)
+        return {"returncode": next(returncodes), "stdout": "", "stderr": "transient"}
+
+    monkeypatch.setattr(dedalus_tools, "_run_gcloud", fake_gcloud)
+    monkeypatch.setattr(dedalus_tools, "_docker_credential_helper_configured", lambda host: False)
+    monkeypatch.setattr(dedalus_tools, "_configured_docker_hosts", set())
+    image = "us-central1-docker.pkg.dev/proj/repo/app:latest"
+
+    await dedalus_tools._ensure_docker_auth(image)
+    assert dedalus_tools._configured_docker_hosts == set()
+
+    await dedalus_tools._ensure_docker_auth(image)
+    await dedalus_tools._ensure_docker_auth(image)
+    assert dedalus_tools._configured_docker_hosts == {"us-central1-docker.pkg.dev"}
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_gcloud_auth_cached_only_once_authenticated(monkeypatch):
+    """Test an unauthenticated probe is retried and an authenticated one is reused."""
+    calls = []
+    auth_lists = iter(["No credentialed accounts.", "* me@example.com"])
+
+    async def fake_command(argv, **kwargs):
+        calls.append(argv)
+        stdout = next(auth_lists) if argv[1:3] == ["auth", "list"] else "Google Cloud SDK"
+        return {"returncode": 0, "stdout": stdout, "stderr": ""}
+
+    monkeypatch.setattr(dedalus_tools, "_run_command", fake_command)
+    dedalus_tools._gcloud_auth_status.cache_clear()
+
+    assert json.loads(await dedalus_tools.check_gcloud_auth())["authenticated"] is False
+    assert json.loads(await dedalus_tools.check_gcloud_auth())["authenticated"] is True
+    assert json.loads(await dedalus_tools.check_gcloud_auth())["authenticated"] is True
+    assert len(calls) == 4
+    dedalus_tools._gcloud_auth_status.cache_clear()
+
+
+@pytest.fixture
+def unreadable_dirs(monkeypatch):
+    """Make os.scandir raise PermissionError for directories added to the returned set."""
+    locked = set()
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if str(path) in locked:
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    return locked
+
+
+@pytest.mark.asyncio
+async def test_extract_api_endpoints_skips_unreadable_dirs(backend_path, java_src, unreadable_dirs):
+    """Test an unreadable package is skipped instead of failing the scan."""
+    (java_src / "TodoController.java").write_text(
+        '@RestController\nclass TodoController {\n  @GetMapping("/todos") void all() {}\n}\n'
+    )
+    (java_src / "secret").mkdir()
+    unreadable_dirs.add(str(java_src / "secret"))
+
+    controllers = json.loads(await extract_api_endpoints(str(backend_path)))
+
+    assert [c["endpoints"] for c in controllers] == [[{"method": "GET", "path": "/todos"}]]
+
+
+@pytest.mark.asyncio
+async def test_analyze_react_app_root_walk_skips_unreadable_dirs(tmp_path, unreadable_dirs):
+    """Test the whole-root walk (no src/) survives an unreadable directory."""
+    frontend = tmp_path / "frontend"
+    (frontend / "app").mkdir(parents=True)
+    (frontend / "app" / "page.tsx").write_text('fetch("https://api.example.com/items")\n')
+    (frontend / ".turbo").mkdir()
+    unreadable_dirs.add(str(frontend / ".turbo"))
+
+    result = json.loads(await analyze_react_app(str(frontend)))
+
+    assert result["api_endpoints"] == ["https://api.example.com/items"]
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_unreadable_tree_forces_rebuild(backend_path, java_src, unreadable_dirs):
+    """Test an unreadable directory yields no fingerprint rather than a partial one."""
+    (java_src / "App.java").write_text("public class App {}\n")
+    unreadable_dirs.add(str(java_src))
+
+    result = json.loads(await dedalus_tools.fingerprint_backend_source(str(backend_path)))
+
+    assert result["success"] is False
+    assert "fingerprint" not in result
+
+
+@pytest.mark.asyncio
+async def test_run_command_handles_lines_longer_than_stream_limit():
+    """Test a single output line over 64 KiB does not fail the command."""
+    r = await dedalus_tools._run_command(
+        [sys.executable, "-c", "import sys; sys.stdout.write('x' * 70000 + '\\ndone\\n')"],
+    )
+
+    assert r["returncode"] == 0
+    assert r["stdout"].split("\n")[-1] == "done"
+    assert len(r["stdout"]) > 64 * 1024
+
+
+@pytest.mark.asyncio
+async def test_run_command_timeout_reaps_child():
+    """Test a timed-out child is killed and waited for."""
+    started = asyncio.get_running_loop().time()
+    r = await dedalus_tools._run_command(
+        [sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2,
+    )
+
+    assert r["returncode"] == 1
+    assert "timed out" in r["stderr"]
+    assert asyncio.get_running_loop().time() - started < 10
+
+
+@pytest.mark.asyncio
+async def test_run_command_reports_missing_executable():
+    """Test an executable missing from PATH yields a clear error, not a crash."""
+    r = await dedalus_tools._run_command(["cloudify-no-such-tool", "--version"])
+
+    assert r["returncode"] == 127
+    assert r["stderr"] == "cloudify-no-such-tool: command not found on PATH"
+
+
+def test_stat_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    """Test per-file memo caches stay within their entry budget."""
+    monkeypatch.setattr(dedalus_tools, "_STAT_CACHE_ENTRIES", 2)
+    calls = []
+
+    @dedalus_tools._cached_by_stat
+    def parse(path):
+        calls.append(path)
+        return path
+
+    paths = []
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_text(name)
+        paths.append(str(tmp_path / name))
+
+    parse(paths[0])
+    parse(paths[1])
+    parse(paths[0])
+    parse(paths[2])  # evicts b, the least recently used
+    parse(paths[0])
+    parse(paths[1])
+
+    assert calls == [paths[0], paths[1], paths[2], paths[1]]
@@ -0,0 +1,95 @@
+"""
+Unit tests for the agent EventBus.
+"""
+
+import pytest
+
+from agents.base_agent import Event, EventBus, EventType
+
+
+@pytest.fixture
+def event_bus():
+    """Create event bus fixture."""
+    return EventBus()
+
+
+@pytest.mark.asyncio
+async def test_get_last_returns_latest_event(event_bus):
+    """Test get_last tracks the most recent event per type."""
+    assert event_bus.get_last(EventType.ANALYSIS_COMPLETE) is None
+
+    for i in range(3):
+        await event_bus.publish(Event(
+            event_type=EventType.ANALYSIS_COMPLETE,
+            source_agent="CodeAnalyzer",
+            data={"run": i},
+        ))
+    await event_bus.publish(Event(
+        event_type=EventType.PROGRESS_UPDATE,
+        source_agent="Orchestrator",
+        data={},
+    ))
+
+    last = event_bus.get_last(EventType.ANALYSIS_COMPLETE)
+    assert last is not None
+    assert last.data == {"run": 2}
+    assert len(event_bus.get_history(EventType.ANALYSIS_COMPLETE)) == 3
+
+
+@pytest.mark.asyncio
+async def test_publish_dispatches_to_subscribers(event_bus):
+    """Test queued events reach sync and async subscribers in order."""
+    received = []
+
+    def on_progress(event):
+        received.append(("sync", event.data["n"]))
+
+    async def on_progress_async(event):
+        received.append(("async", event.data["n"]))
+
+    event_bus.subscribe(EventType.PROGRESS_UPDATE, on_progress)
+    event_bus.subscribe(EventType.PROGRESS_UPDATE, on_progress_async)
+
+    for n in range(3):
+        await event_bus.publish(Event(
+            event_type=EventType.PROGRESS_UPDATE,
+            source_agent="Orchestrator",
+            data={"n": n},
+        ))
+    await event_bus.drain()
+
+    assert [n for kind, n in received if kind == "sync"] == [0, 1, 2]
+    assert [n for kind, n in received if kind == "async"] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_publish_sync_delivers_inline(event_bus):
+    """Test publish_sync returns only after subscribers ran."""
+    received = []
+    event_bus.subscribe(EventType.BACKEND_DEPLOYED, lambda e: received.append(e.data))
+
+    await event_bus.publish_sync(Event(
+        event_type=EventType.BACKEND_DEPLOYED,
+        source_agent="BackendDeployment",
+        data={"service_url": "https://svc.run.app"},
+    ))
+
+    assert received == [{"service_url": "https://svc.run.app"}]
+
+
+@pytest.mark.asyncio
+async def test_history_is_bounded_per_type(event_bus):
+    """Test history buffers drop the oldest events once full."""
+    event_bus.TYPE_HISTORY_SIZE = 3
+    event_bus._by_type.clear()
+
+    for n in range(5):
+        await event_bus.publish_sync(Event(
+            event_type=EventType.TOOL_INVOKED,
+            source_agent="CodeAnalyzer",
+            data={"n": n},
+        ))
+
+    history = event_bus.get_history(EventType.TOOL_INVOKED)
+    assert [e.data["n"] for e in history] == [2, 3, 4]
+    assert len(event_bus.get_history()) == 5
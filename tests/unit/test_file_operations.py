@@ -0,0 +1,27 @@
+"""
+Unit tests for file operation utilities.
+"""
+
+import os
+
+from utils.file_operations import FileOperations
+
+
+def test_find_files_skips_unreadable_directories(tmp_path, monkeypatch):
+    """Test one unreadable directory does not hide matches elsewhere in the tree."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "App.java").write_text("class App {}\n")
+    locked = tmp_path / "locked"
+    locked.mkdir()
+    (locked / "Hidden.java").write_text("class Hidden {}\n")
+
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if path == str(locked):
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    assert FileOperations().find_files(tmp_path, "*.java") == [tmp_path / "src" / "App.java"]
@@ -0,0 +1,98 @@
+"""
+Unit tests for the Orchestrator dependency scheduler.
+"""
+
+import pytest
+
+from agents.base_agent import AgentResult, AgentStatus, EventBus, EventType
+from agents.orchestrator import OrchestratorAgent
+
+
+class StubAgent:
+    """Minimal agent exposing the scheduler contract."""
+
+    def __init__(self, name, depends_on=(), publishes=(), status=AgentStatus.SUCCESS, log=None):
+        self.name = name
+        self.DEPENDS_ON = frozenset(depends_on)
+        self.PUBLISHES = frozenset(publishes)
+        self.status = status
+        self.log = log if log is not None else []
+
+    async def execute(self):
+        self.log.append(self.name)
+        return AgentResult(status=self.status, data={})
+
+
+@pytest.fixture
+def orchestrator():
+    """Create orchestrator fixture."""
+    return OrchestratorAgent(
+        event_bus=EventBus(),
+        config={"migration": {"agents": {"parallel_execution": True}}},
+        dedalus_api_key="test-key",
+    )
+
+
+def _pipeline(log, analyzer_status=AgentStatus.SUCCESS, infra_status=AgentStatus.SUCCESS):
+    return [
+        StubAgent("FrontendDeployment", [EventType.BACKEND_DEPLOYED], [EventType.FRONTEND_DEPLOYED], log=log),
+        StubAgent(
+            "BackendDeployment",
+            [EventType.INFRASTRUCTURE_READY, EventType.ANALYSIS_COMPLETE],
+            [EventType.BACKEND_DEPLOYED],
+            log=log,
+        ),
+        StubAgent(
+            "DatabaseMigration",
+            [EventType.ANALYSIS_COMPLETE, EventType.INFRASTRUCTURE_READY],
+            [EventType.DATABASE_MIGRATED],
+            log=log,
+        ),
+        StubAgent(
+            "Infrastructure",
+            [EventType.ANALYSIS_COMPLETE],
+            [EventType.INFRASTRUCTURE_READY],
+            status=infra_status,
+            log=log,
+        ),
+        StubAgent("CodeAnalyzer", [], [EventType.ANALYSIS_COMPLETE], status=analyzer_status, log=log),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_agents_run_in_dependency_order(orchestrator):
+    """Test every agent runs after the agents it depends on."""
+    log = []
+    results = await orchestrator._execute_agents_with_dependencies(_pipeline(log))
+
+    assert len(results) == 5
+    assert log.index("CodeAnalyzer") < log.index("Infrastructure")
+    assert log.index("Infrastructure") < log.index("DatabaseMigration")
+    assert log.index("CodeAnalyzer") < log.index("BackendDeployment")
+    assert log.index("Infrastructure") < log.index("BackendDeployment")
+    assert log.index("BackendDeployment") < log.index("FrontendDeployment")
+
+
+@pytest.mark.asyncio
+async def test_failed_agent_skips_dependents(orchestrator):
+    """Test a failed upstream agent prevents its transitive dependents from running."""
+    log = []
+    results = await orchestrator._execute_agents_with_dependencies(
+        _pipeline(log, analyzer_status=AgentStatus.FAILED),
+    )
+
+    assert results["CodeAnalyzer"].status == AgentStatus.FAILED
+    assert list(results) == ["CodeAnalyzer"]
+    assert log == ["CodeAnalyzer"]
+
+
+@pytest.mark.asyncio
+async def test_failed_infrastructure_skips_database_and_deploys(orchestrator):
+    """Test no Cloud SQL or deployment work starts when provisioning fails."""
+    log = []
+    results = await orchestrator._execute_agents_with_dependencies(
+        _pipeline(log, infra_status=AgentStatus.FAILED),
+    )
+
+    assert results["Infrastructure"].status == AgentStatus.FAILED
+    assert log == ["CodeAnalyzer", "Infrastructure"]
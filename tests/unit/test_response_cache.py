@@ -0,0 +1,221 @@
+"""
+Unit tests for the shared LLM response cache.
+"""
+
+import asyncio
+import stat
+from types import SimpleNamespace
+
+import pytest
+
+from agents.base_agent import (
+    AgentResult,
+    AgentStatus,
+    BaseAgent,
+    EventBus,
+    ModelRole,
+    ResponseCache,
+    _response_cache,
+)
+
+
+def test_lookup_returns_stored_response():
+    """Test a stored response is returned until its TTL expires."""
+    cache = ResponseCache()
+    key = ResponseCache.make_key("openai/gpt-4.1-mini", "summarize", instructions="be brief")
+
+    assert cache.lookup(key) is None
+    cache.update(key, "done", ttl=60)
+    assert cache.lookup(key) == "done"
+
+    cache.update(key, "stale", ttl=-1)
+    assert cache.lookup(key) is None
+
+
+def test_key_depends_on_tools_and_model():
+    """Test keys differ when the model or tool set differs."""
+    def tool_a():
+        pass
+
+    def tool_b():
+        pass
+
+    base = ResponseCache.make_key("m1", "prompt", tools=[tool_a, tool_b])
+    assert base == ResponseCache.make_key("m1", "prompt", tools=[tool_b, tool_a])
+    assert base != ResponseCache.make_key("m2", "prompt", tools=[tool_a, tool_b])
+    assert base != ResponseCache.make_key("m1", "prompt", tools=[tool_a])
+
+
+def test_eviction_drops_least_frequently_used():
+    """Test a full cache evicts the entry with the fewest hits."""
+    cache = ResponseCache(max_entries=2)
+    cache.update("hot", "h", ttl=60)
+    cache.update("cold", "c", ttl=60)
+    cache.lookup("hot")
+
+    cache.update("new", "n", ttl=60)
+
+    assert cache.lookup("cold") is None
+    assert cache.lookup("hot") == "h"
+    assert cache.lookup("new") == "n"
+
+
+def test_lookup_similar_respects_threshold_and_scope():
+    """Test near-duplicate embeddings hit only within the same scope."""
+    cache = ResponseCache()
+    cache.update("k1", "cached answer", ttl=60)
+    cache.add_embedding("scope-a", [1.0, 0.0, 0.0], "k1")
+
+    assert cache.lookup_similar("scope-a", [0.99, 0.05, 0.0], threshold=0.92) == "cached answer"
+    assert cache.lookup_similar("scope-a", [0.0, 1.0, 0.0], threshold=0.92) is None
+    assert cache.lookup_similar("scope-b", [1.0, 0.0, 0.0], threshold=0.92) is None
+
+
+class _CountingRunner:
+    """Runner stub that counts calls and yields once so callers overlap."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def run(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(final_output=f"answer to {kwargs['input']}", tools_called=[])
+
+
+class _StubAgent(BaseAgent):
+    async def _execute_impl(self):
+        return AgentResult(status=AgentStatus.SUCCESS, data={})
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_call():
+    """Test singleflight coalesces identical in-flight run_with_dedalus calls."""
+    _response_cache.clear()
+    agent = _StubAgent(name="Stub", event_bus=EventBus(), config={}, dedalus_api_key="test-key")
+    agent.runner = _CountingRunner()
+
+    results = await asyncio.gather(*[
+        agent.run_with_dedalus(prompt="singleflight prompt", model="openai/gpt-4.1-mini")
+        for _ in range(3)
+    ])
+
+    assert results == ["answer to singleflight prompt"] * 3
+    assert agent.runner.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_follower_survives_cancelled_leader():
+    """Test a follower issues its own call when the request it joined is cancelled."""
+    _response_cache.clear()
+    agent = _StubAgent(name="Stub", event_bus=EventBus(), config={}, dedalus_api_key="test-key")
+    agent.runner = _CountingRunner()
+
+    leader = asyncio.create_task(agent.run_with_dedalus(prompt="cancel prompt", model="openai/gpt-4.1-mini"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(agent.run_with_dedalus(prompt="cancel prompt", model="openai/gpt-4.1-mini"))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "answer to cancel prompt"
+    assert leader.cancelled()
+    assert agent.runner.calls == 2
+
+
+def test_pick_model_routes_by_request_shape():
+    """Test requests without an explicit model are routed by cost."""
+    agent = _StubAgent(
+        name="Stub", event_bus=EventBus(),
+        config={"ai": {"model": "openai/gpt-4.1"}}, dedalus_api_key="test-key",
+    )
+
+    assert agent._pick_model("Summarize this.", None, max_steps=1) == ModelRole.FAST.value
+    assert agent._pick_model("Write a Dockerfile.", [len], max_steps=3) == ModelRole.CODE_GENERATION.value
+    assert agent._pick_model("Review the setup.", [len], max_steps=3) == "openai/gpt-4.1"
+
+
+class _ReportingRunner:
+    """Runner stub that fires on_tool_event and also returns tools_called."""
+
+    async def run(self, **kwargs):
+        kwargs["on_tool_event"](SimpleNamespace(tool_name="check_gcloud_auth"))
+        return SimpleNamespace(final_output="ok", tools_called=["check_gcloud_auth"])
+
+
+@pytest.mark.asyncio
+async def test_runner_tool_calls_counted_once():
+    """Test a tool reported via on_tool_event is not re-added from RunResult."""
+    agent = _StubAgent(name="Stub", event_bus=EventBus(), config={}, dedalus_api_key="test-key")
+    agent.runner = _ReportingRunner()
+
+    await agent.run_with_dedalus(prompt="review", model="openai/gpt-4.1-mini", use_cache=False)
+
+    assert agent._tools_called == ["check_gcloud_auth"]
+
+
+class _StreamingRunner:
+    """Runner stub that returns an async iterator of chat chunks."""
+
+    def run(self, **kwargs):
+        assert kwargs["stream"] is True
+
+        async def chunks():
+            for text in ["FROM ", None, "eclipse-temurin:21"]:
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+        return chunks()
+
+
+@pytest.mark.asyncio
+async def test_stream_with_dedalus_yields_text_deltas():
+    """Test streamed chunks are surfaced as text fragments in order."""
+    agent = _StubAgent(name="Stub", event_bus=EventBus(), config={}, dedalus_api_key="test-key")
+    agent.runner = _StreamingRunner()
+
+    parts = [part async for part in agent.stream_with_dedalus("Dockerfile please", model="openai/gpt-4.1-mini")]
+
+    assert parts == ["FROM ", "eclipse-temurin:21"]
+
+
+def test_recommendations_persist_across_runs(tmp_path, monkeypatch):
+    """Test stored recommendations are reloaded unless regeneration is forced."""
+    monkeypatch.setattr(BaseAgent, "_recommendations_cache_path", staticmethod(lambda: tmp_path))
+    agent = _StubAgent(name="Stub", event_bus=EventBus(), config={}, dedalus_api_key="test-key")
+    cache_file = agent._recommendations_cache_file(["h2", "in-memory", "cloud_sql"])
+
+    assert agent._load_cached_recommendations(cache_file) is None
+    agent._store_cached_recommendations(cache_file, ["Use Cloud SQL"])
+    assert agent._load_cached_recommendations(cache_file) == ["Use Cloud SQL"]
+    assert cache_file != agent._recommendations_cache_file(["h2", "in-memory", "keep"])
+
+    agent.config = {"ai": {"force_regenerate_recommendations": True}}
+    assert agent._load_cached_recommendations(cache_file) is None
+
+
+def test_private_cache_rejects_entries_others_can_write(tmp_path):
+    """Test cache entries are written private and shared-writable ones are ignored."""
+    cache_file = tmp_path / "dockerfiles" / "key"
+    BaseAgent._write_private_cache(cache_file, "FROM eclipse-temurin:21\n")
+
+    assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+    assert stat.S_IMODE(cache_file.parent.stat().st_mode) & 0o077 == 0
+    assert BaseAgent._read_private_cache(cache_file) == "FROM eclipse-temurin:21\n"
+
+    cache_file.chmod(0o666)
+    assert BaseAgent._read_private_cache(cache_file) is None
+
+    cache_file.chmod(0o600)
+    cache_file.parent.chmod(0o777)
+    assert BaseAgent._read_private_cache(cache_file) is None
+
+
+@pytest.mark.asyncio
+async def test_run_without_model_uses_routing():
+    """Test a call site omitting model= is served by the routed model."""
+    _response_cache.clear()
+    agent = _StubAgent(name="Stub", event_bus=EventBus(), config={}, dedalus_api_key="test-key")
+    agent.runner = _CountingRunner()
+
+    await agent.run_with_dedalus(prompt="Give 1-2 quick checks.", max_steps=1)
+
+    assert agent._models_used == [ModelRole.FAST.value]
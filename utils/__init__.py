@@ -5,5 +5,6 @@ Utility modules for Cloudify migration system.
 from .gcp_helpers import GCPHelper
 from .file_operations import FileOperations
 from .logger import setup_logging
+from .eventloop import install_event_loop
 
-__all__ = ["GCPHelper", "FileOperations", "setup_logging"]
+__all__ = ["GCPHelper", "FileOperations", "setup_logging", "install_event_loop"]
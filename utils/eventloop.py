@@ -0,0 +1,37 @@
+"""
+Event loop selection for Cloudify.
+"""
+
+import asyncio
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def install_event_loop() -> str:
+    """
+    Install the fastest available asyncio event loop policy.
+
+    Uses uvloop on POSIX when it is installed. uvloop does not support
+    Windows and does not build on Python 3.14+ (free-threaded builds
+    included), so those platforms keep the stdlib loop: ProactorEventLoop
+    on Windows, SelectorEventLoop elsewhere.
+
+    Returns:
+        Name of the event loop implementation in use.
+    """
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        return "proactor"
+
+    if sys.version_info < (3, 14):
+        try:
+            import uvloop
+        except ImportError:
+            logger.debug("uvloop not installed, using the stdlib event loop")
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            return "uvloop"
+
+    return "asyncio"
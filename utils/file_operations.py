@@ -2,8 +2,10 @@
 File operation utilities.
 """
 
+import fnmatch
 import json
 import logging
+import os
 import shutil
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -180,6 +182,8 @@ class FileOperations:
             List of matching file paths
         """
         try:
+            if recursive and "/" not in pattern:
+                return self._walk_matching(directory, pattern)
             if recursive:
                 return list(directory.rglob(pattern))
             else:
@@ -188,6 +192,27 @@ class FileOperations:
             self.logger.error(f"Error finding files: {str(e)}")
             return []
 
+    @staticmethod
+    def _walk_matching(directory: Path, pattern: str) -> list[Path]:
+        """Recursive name match with os.scandir (no Path object per visited entry).
+
+        Unreadable directories are skipped, as with Path.rglob.
+        """
+        matches: list[Path] = []
+        stack = [str(directory)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if fnmatch.fnmatchcase(entry.name, pattern):
+                        matches.append(Path(entry.path))
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        return matches
+
     def ensure_directory(self, directory: Path) -> bool:
         """
         Ensure directory exists.
@@ -41,6 +41,9 @@ app.add_middleware(
 
 _migrations: Dict[str, MigrationProcess] = {}
 
+_LINE_CONTINUATION_RE = re.compile(r"\\\s*\n")
+_NEWLINE_RE = re.compile(r"\s*\n\s*")
+
 
 def _format_line(line: str, stream: str) -> str:
     prefix = "STDOUT" if stream == "stdout" else "STDERR"
@@ -64,8 +67,8 @@ async def _run_migration(migration_id: str, args: str) -> None:
     cmd = [sys.executable, "migration_orchestrator.py", "migrate"]
     if args.strip():
         # Normalize backslash-newline continuations and newlines into spaces
-        normalized = re.sub(r"\\\s*\n", " ", args)
-        normalized = re.sub(r"\s*\n\s*", " ", normalized)
+        normalized = _LINE_CONTINUATION_RE.sub(" ", args)
+        normalized = _NEWLINE_RE.sub(" ", normalized)
         tokens = [t.strip() for t in shlex.split(normalized) if t.strip()]
 
         # If user pasted the full command, drop the leading parts up to "migrate".